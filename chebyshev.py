@@ -0,0 +1,103 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def chebyshev_fit(x_data: List[float], y_data: List[float], degree: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Fits a polynomial in the Chebyshev basis on centred and scaled x-values.
+    The nodes are mapped onto [-1, 1] before fitting, so large raw x-values
+    (e.g. Unix timestamps) do not lose precision. The coefficients are found
+    through a QR factorisation of the Chebyshev-Vandermonde matrix.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+        degree: Polynomial degree; defaults to n - 1 (interpolation). A lower
+                degree gives a least-squares fit.
+
+    Returns:
+        A dict with 'centre', 'scale', 'coef' and 'condition_number'.
+    """
+    import numpy as np
+
+    n = len(x_data)
+    if n < 2 or n != len(y_data):
+        raise ValueError(f"Chebyshev method requires a minimum of 2 points. Got {n}.")
+    degree = n - 1 if degree is None else degree
+    if not 1 <= degree <= n - 1:
+        raise ValueError(f"Chebyshev degree must be between 1 and {n - 1}. Got {degree}.")
+
+    x = np.asarray(x_data, dtype=float)
+    centre = 0.5 * (x.max() + x.min())
+    scale = 0.5 * (x.max() - x.min())
+    if scale == 0 or len(np.unique(x)) < n:
+        raise ValueError("Error: Chebyshev method detected identical x-values.")
+
+    vandermonde = np.polynomial.chebyshev.chebvander((x - centre) / scale, degree)
+    Q, R = np.linalg.qr(vandermonde)
+    coef = np.linalg.solve(R, Q.T @ np.asarray(y_data, dtype=float))
+    return {
+        'centre': float(centre),
+        'scale': float(scale),
+        'coef': coef,
+        'condition_number': float(np.linalg.cond(R))
+    }
+
+
+def chebyshev_evaluate(fit: Dict[str, Any], x_targets) -> 'np.ndarray':
+    """
+    Evaluates a Chebyshev fit at one or more x-values.
+
+    Args:
+        fit: A fit as returned by chebyshev_fit.
+        x_targets: Scalar or sequence of raw x-values.
+
+    Returns:
+        An array of predicted y-values.
+    """
+    import numpy as np
+
+    t = (np.asarray(x_targets, dtype=float) - fit['centre']) / fit['scale']
+    return np.polynomial.chebyshev.chebval(t, fit['coef'])
+
+
+def chebyshev_basis(fit: Dict[str, Any], x_target: float) -> 'np.ndarray':
+    """
+    Chebyshev basis values T_0(t) ... T_d(t) of a fit at one raw x-value,
+    where t is the x-value normalized as in the fit.
+
+    Returns:
+        An array with one value per coefficient of the fit.
+    """
+    import numpy as np
+
+    t = (float(x_target) - fit['centre']) / fit['scale']
+    return np.polynomial.chebyshev.chebvander(t, len(fit['coef']) - 1).reshape(-1)
+
+
+def chebyshev_interpolation_many(x_data: List[float], y_data: List[float], x_targets) -> Tuple['np.ndarray', float]:
+    """
+    Vectorized Chebyshev extrapolation of several targets sharing one data subset.
+
+    Returns:
+        A tuple (array of predicted y-values, condition number estimate of the fit).
+    """
+    fit = chebyshev_fit(x_data, y_data)
+    return chebyshev_evaluate(fit, x_targets), fit['condition_number']
+
+
+def chebyshev_interpolation_columns(x_data: List[float], y_columns, x_targets) -> 'np.ndarray':
+    """
+    Chebyshev extrapolation of several y-series sharing one data subset.
+    One QR factorisation of the Chebyshev-Vandermonde matrix solves for all series.
+
+    Returns:
+        A (len(x_targets), K) array of predicted values.
+    """
+    import numpy as np
+
+    y = np.asarray(y_columns, dtype=float)
+    fit = chebyshev_fit(x_data, y.reshape(len(y), -1))
+    return np.atleast_2d(chebyshev_evaluate(fit, np.asarray(x_targets, dtype=float).reshape(-1))).T
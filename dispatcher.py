@@ -0,0 +1,292 @@
+import json
+import os
+import platform
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from kernels import backend, get_kernel
+from lagrange import lagrange_interpolation, lagrange_interpolation_columns, lagrange_interpolation_many
+from dividedDifference import (
+    divided_difference_coefficients,
+    divided_difference_interpolation_columns,
+    divided_difference_interpolation_many,
+    newton_horner_steps,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Bumped whenever the calibration layout or the engine set changes
+CALIBRATION_VERSION = 2
+
+# Grid of subset sizes and target counts timed by the calibration
+CALIBRATION_SIZES = (2, 3, 4, 6, 8, 12, 16, 24)
+CALIBRATION_TARGETS = (1, 4, 16, 64, 256)
+
+# Number of y-series the column engines are timed with
+CALIBRATION_COLUMNS = 4
+
+# Largest deviation from the reference engine (relative to the data range)
+# for an engine to count as numerically equivalent on a calibration case
+EQUIVALENCE_TOLERANCE = 1e-9
+
+# Smallest subset size at which each compiled kernel beats the pure-Python
+# reference once the list -> array -> list conversion around it is counted
+# (measured per call with Numba 0.68 on x86-64; below it the reference runs).
+# Callers that keep arrays end to end, like _newton_loop, use the kernels at any size.
+KERNEL_MIN_POINTS = {
+    'lagrange_weights': 5,
+    'divided_difference_table': 8,
+    'horner_steps': 20,
+}
+
+# Overrides the cache directory (default: $XDG_CACHE_HOME/smarttrend or ~/.cache/smarttrend)
+CACHE_ENV = 'SMARTTREND_CACHE_DIR'
+
+
+def _lagrange_loop(x_data, y_data, x_targets) -> 'np.ndarray':
+    # Scalar engine per target: no NumPy broadcasting overhead for tiny problems
+    import numpy as np
+
+    x_nodes = [float(x) for x in x_data]
+    y_nodes = [float(y) for y in y_data]
+    return np.array([lagrange_interpolation(x_nodes, y_nodes, float(t)) for t in np.ravel(x_targets)])
+
+
+def _newton_loop(x_data, y_data, x_targets) -> 'np.ndarray':
+    # Coefficients once, then a scalar Horner evaluation per target
+    import numpy as np
+
+    x_nodes = [float(x) for x in x_data]
+    coef = divided_difference_coefficients(x_nodes, [float(y) for y in y_data])
+    kernel = get_kernel('horner_steps')
+    if kernel is not None:
+        x_array, coef_array, steps = np.array(x_nodes), np.array(coef), np.empty(len(coef))
+        predictions = np.empty(np.size(x_targets))
+        for m, t in enumerate(np.ravel(x_targets).tolist()):
+            kernel(x_array, coef_array, t, steps)
+            predictions[m] = steps[-1]
+        return predictions
+    return np.array([newton_horner_steps(x_nodes, coef, float(t))[-1] for t in np.ravel(x_targets)])
+
+
+# Interchangeable engines: (x_data, y_data, x_targets) -> array of predictions
+AUTO_ENGINES: Dict[str, Callable] = {
+    'lagrange_loop': _lagrange_loop,
+    'newton_loop': _newton_loop,
+    'lagrange_vectorized': lagrange_interpolation_many,
+    'newton_vectorized': divided_difference_interpolation_many,
+}
+
+# Scalar engines, the ones that run when a step-by-step solution is rendered
+SCALAR_ENGINES = ('lagrange_loop', 'newton_loop')
+
+# Interchangeable multi-series engines: (x_data, Y, x_targets) -> (targets, K) array
+COLUMN_AUTO_ENGINES: Dict[str, Callable] = {
+    'lagrange_columns': lagrange_interpolation_columns,
+    'newton_columns': divided_difference_interpolation_columns,
+}
+
+# Method (engine family) of each engine
+ENGINE_METHODS = {
+    'lagrange_loop': 'Lagrange',
+    'newton_loop': 'Divided Difference',
+    'lagrange_vectorized': 'Lagrange',
+    'newton_vectorized': 'Divided Difference',
+    'lagrange_columns': 'Lagrange',
+    'newton_columns': 'Divided Difference',
+}
+
+
+def default_cache_path() -> str:
+    """Location of the calibration cache, honouring SMARTTREND_CACHE_DIR and XDG_CACHE_HOME."""
+    directory = os.environ.get(CACHE_ENV)
+    if not directory:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        directory = os.path.join(base, 'smarttrend')
+    return os.path.join(directory, 'dispatch.json')
+
+
+def machine_fingerprint() -> Dict[str, str]:
+    """Everything a calibration depends on; a cached table is reused only on an exact match."""
+    import numpy as np
+
+    return {
+        'python': platform.python_version(),
+        'implementation': sys.implementation.name,
+        'numpy': np.__version__,
+        'kernels': backend(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+    }
+
+
+def _grid_index(grid: Sequence[int], value: int) -> int:
+    # Smallest grid point >= value, or the last one
+    for i, point in enumerate(grid):
+        if value <= point:
+            return i
+    return len(grid) - 1
+
+
+class EngineDispatcher:
+    """
+    Routes each interpolation request to the fastest of several numerically
+    equivalent engines. The crossover points depend on the machine (NumPy call
+    overhead, compiled kernels), so they are measured by a short calibration
+    microbenchmark on first use and cached on disk.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None):
+        self.cache_path = cache_path or default_cache_path()
+        self.calibration: Optional[Dict[str, Any]] = None
+
+    def load(self) -> bool:
+        """Loads a cached calibration if it matches this machine; returns whether one was loaded."""
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if cached.get('version') != CALIBRATION_VERSION or cached.get('fingerprint') != machine_fingerprint():
+            return False
+        self.calibration = cached
+        return True
+
+    def calibrate(self, sizes: Sequence[int] = CALIBRATION_SIZES,
+                  target_counts: Sequence[int] = CALIBRATION_TARGETS, repeats: int = 3) -> Dict[str, Any]:
+        """
+        Times every engine (single-series and column engines) on each
+        (subset size, target count) cell. Engines that disagree with the vectorized
+        Newton reference on a cell get no timing there and are never routed to it.
+        The result is written to the cache file when it is writable.
+
+        Args:
+            sizes: Subset sizes to time.
+            target_counts: Numbers of targets per call to time.
+            repeats: Timing repeats per engine and cell; the best one counts.
+
+        Returns:
+            The calibration record (also kept in self.calibration).
+        """
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        engines = dict(AUTO_ENGINES, **COLUMN_AUTO_ENGINES)
+        # timings[name][i][j]: best seconds per call on cell (sizes[i], target_counts[j]), or None
+        timings: Dict[str, List[List[Optional[float]]]] = {name: [] for name in engines}
+        for n in sizes:
+            x = np.sort(rng.choice(np.arange(1, 10 * n + 1), n, replace=False)).astype(float)
+            y = rng.uniform(2.0, 9.0, (n, CALIBRATION_COLUMNS))
+            for name in engines:
+                timings[name].append([])
+            for m in target_counts:
+                targets = x[-1] + rng.uniform(0.0, 2.0, m)
+                cases = {
+                    name: (y[:, 0], divided_difference_interpolation_many(x, y[:, 0], targets))
+                    for name in AUTO_ENGINES
+                }
+                column_reference = divided_difference_interpolation_columns(x, y, targets)
+                cases.update({name: (y, column_reference) for name in COLUMN_AUTO_ENGINES})
+                for name, engine in engines.items():
+                    values, reference = cases[name]
+                    result = engine(x, values, targets)  # also warms up compiled kernels
+                    scale = max(1.0, float(np.max(np.abs(reference))))
+                    if not np.max(np.abs(result - reference)) <= EQUIVALENCE_TOLERANCE * scale:
+                        timings[name][-1].append(None)
+                        continue
+                    loops = max(1, 64 // m)
+                    elapsed = float('inf')
+                    for _ in range(repeats):
+                        started = time.perf_counter()
+                        for _ in range(loops):
+                            engine(x, values, targets)
+                        elapsed = min(elapsed, (time.perf_counter() - started) / loops)
+                    timings[name][-1].append(elapsed)
+
+        self.calibration = {
+            'version': CALIBRATION_VERSION,
+            'fingerprint': machine_fingerprint(),
+            'sizes': list(sizes),
+            'target_counts': list(target_counts),
+            'timings': timings,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self.calibration, f, indent=1)
+        except OSError:
+            pass  # Read-only home: keep the calibration for this process only
+        return self.calibration
+
+    def route(self, num_points: int, num_targets: int = 1,
+              engines: Sequence[str] = tuple(AUTO_ENGINES)) -> str:
+        """
+        Returns the name of the fastest of `engines` for a subset size and target
+        count, calibrating first if no matching calibration is cached.
+
+        Args:
+            num_points: Subset size.
+            num_targets: Number of targets evaluated in one call.
+            engines: Candidate engine names; all single-series engines by default.
+        """
+        if self.calibration is None and not self.load():
+            self.calibrate()
+        calibration = self.calibration
+        i = _grid_index(calibration['sizes'], num_points)
+        j = _grid_index(calibration['target_counts'], num_targets)
+        timed = [(calibration['timings'][name][i][j], name) for name in engines
+                 if calibration['timings'][name][i][j] is not None]
+        # The last candidate serves cells where no engine matched the reference
+        return min(timed)[1] if timed else engines[-1]
+
+    def interpolate_many(self, x_data, y_data, x_targets) -> Tuple['np.ndarray', str]:
+        """
+        Predicts all targets through the routed engine.
+
+        Returns:
+            A tuple (predicted values, engine name).
+        """
+        import numpy as np
+
+        targets = np.asarray(x_targets, dtype=float).reshape(-1)
+        name = self.route(len(x_data), len(targets))
+        return AUTO_ENGINES[name](x_data, y_data, targets), name
+
+    def interpolate_columns(self, x_data, y_columns, x_targets) -> Tuple['np.ndarray', str]:
+        """
+        Predicts several y-series at all targets through the routed column engine.
+
+        Returns:
+            A tuple ((len(x_targets), K) array of predicted values, engine name).
+        """
+        import numpy as np
+
+        targets = np.asarray(x_targets, dtype=float).reshape(-1)
+        name = self.route(len(x_data), len(targets), tuple(COLUMN_AUTO_ENGINES))
+        return COLUMN_AUTO_ENGINES[name](x_data, y_columns, targets), name
+
+
+# Process-wide dispatcher behind the 'Auto' method
+DISPATCHER = EngineDispatcher()
+
+
+def auto_interpolation_many(x_data, y_data, x_targets) -> 'np.ndarray':
+    """Batch engine for the 'Auto' method (see EngineDispatcher)."""
+    return DISPATCHER.interpolate_many(x_data, y_data, x_targets)[0]
+
+
+def auto_interpolation_columns(x_data, y_columns, x_targets) -> 'np.ndarray':
+    """Column engine for the 'Auto' method (see EngineDispatcher)."""
+    return DISPATCHER.interpolate_columns(x_data, y_columns, x_targets)[0]
+
+
+if __name__ == '__main__':
+    calibration = DISPATCHER.calibrate()
+    print(f"Calibration written to {DISPATCHER.cache_path}")
+    for title, engines in (('Single series', tuple(AUTO_ENGINES)), ('Solutions', SCALAR_ENGINES),
+                           ('Multi-series', tuple(COLUMN_AUTO_ENGINES))):
+        print(f"\n{title}\nn \\ targets " + " ".join(f"{m:>20}" for m in calibration['target_counts']))
+        for n in calibration['sizes']:
+            print(f"{n:>11} " + " ".join(f"{DISPATCHER.route(n, m, engines):>20}" for m in calibration['target_counts']))
@@ -1,46 +1,458 @@
-from typing import List
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
 
+from kernels import get_kernel
 
-def divided_difference_interpolation(x_data: List[float], y_data: List[float], x_predict: float) -> float:
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def divided_difference_coefficients(x_data: List[float], y_data: List[float]) -> List[float]:
     """
-    Performs Newton's Divided Difference extrapolation (via interpolation polynomial).
-    Requires a minimum of 2 data points (n >= 2).
-    
+    Builds the Newton coefficients f[x0], f[x0,x1], ..., f[x0,...,x_{n-1}].
+    Uses the compiled kernel when an accelerated backend is available and the
+    subset is large enough to pay for the array conversion.
+
     Args:
         x_data: List of x-coordinates (time).
         y_data: List of y-coordinates (value).
-        x_predict: The x-value for which to predict y.
-        
+
     Returns:
-        The predicted y-value.
+        The top diagonal of the divided difference table.
+    """
+    n = len(x_data)
+    if n < 2 or n != len(y_data):
+        raise ValueError(f"Divided Difference method requires a minimum of 2 points. Got {n}.")
+
+    rows = _divided_difference_rows(x_data, y_data)
+    if rows is not None:
+        return rows[-1].tolist()
+    return divided_difference_coefficients_reference(x_data, y_data)
+
+
+def divided_difference_coefficients_reference(x_data: List[float], y_data: List[float]) -> List[float]:
+    """Pure-Python reference for divided_difference_coefficients (also the fallback)."""
+    return [column[0] for column in divided_difference_table_reference(x_data, y_data)]
+
+
+def _divided_difference_rows(x_data: List[float], y_data: List[float]) -> Optional['np.ndarray']:
+    # Compiled table: row i is the in-place coefficient vector after order i
+    # (see kernels._divided_difference_kernel); None without an accelerated backend
+    # or below its KERNEL_MIN_POINTS size
+    n = len(x_data)
+    kernel = get_kernel('divided_difference_table', n)
+    if kernel is None:
+        return None
+    import numpy as np
+    rows = np.empty((n, n))
+    rows[0] = y_data
+    kernel(np.array(x_data, dtype=np.float64), rows)
+    return rows
+
+
+def divided_difference_table(x_data: List[float], y_data: List[float]) -> List[List[float]]:
+    """
+    Builds the full divided difference table, keeping every order. Its column
+    heads are the Newton coefficients, computed with the same operations as
+    divided_difference_coefficients. Uses the compiled kernel under the same
+    conditions as divided_difference_coefficients.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+
+    Returns:
+        A list of columns where table[j][i - j] = f[x_{i-j}, ..., x_i]; the Newton
+        coefficients are the column heads table[j][0].
     """
     n = len(x_data)
     if n < 2 or n != len(y_data):
         raise ValueError(f"Divided Difference method requires a minimum of 2 points. Got {n}.")
 
-    # 1. Initialize the divided difference table
-    # We only need the first column (the coefficients)
-    coef = list(y_data) 
-    
-    # 2. Compute the divided differences (in-place modification of coef)
+    rows = _divided_difference_rows(x_data, y_data)
+    if rows is not None:
+        return [row[j:] for j, row in enumerate(rows.tolist())]
+    return divided_difference_table_reference(x_data, y_data)
+
+
+def divided_difference_table_reference(x_data: List[float], y_data: List[float]) -> List[List[float]]:
+    """Pure-Python reference for divided_difference_table (also the fallback)."""
+    n = len(x_data)
+
+    # 1. Initialize the divided difference table with order 0 (the y-values)
+    coef = list(y_data)
+    table = [list(coef)]
+
+    # 2. Compute the divided differences (in-place modification of coef), one order at a time
     for i in range(1, n):
         for j in range(n - 1, i - 1, -1):
             # f[x_j, ..., x_{j-i}] = (f[x_j, ...] - f[x_{j-1}, ...]) / (x_j - x_{j-i})
             numerator = coef[j] - coef[j-1]
             denominator = x_data[j] - x_data[j-i]
-            
+
             if denominator == 0:
                 raise ValueError("Error: Divided difference method detected identical x-values.")
-            
+
             coef[j] = numerator / denominator
+        table.append(coef[i:])
+
+    return table
+
+
+def divided_difference_interpolation(x_data: List[float], y_data: List[float], x_predict: float) -> float:
+    """
+    Performs Newton's Divided Difference extrapolation (via interpolation polynomial).
+    Requires a minimum of 2 data points (n >= 2).
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+        x_predict: The x-value for which to predict y.
+
+    Returns:
+        The predicted y-value.
+    """
+    coef = divided_difference_coefficients(x_data, y_data)
+    return newton_horner_steps(x_data, coef, x_predict)[-1]
+
+
+def newton_horner_steps(x_data: List[float], coef: List[float], x_predict: float) -> List[float]:
+    """
+    Horner evaluation of a Newton-form polynomial, keeping every intermediate value.
+    Uses the compiled kernel when an accelerated backend is available and the
+    polynomial is long enough to pay for the array conversion.
+
+    Returns:
+        The successive Horner values, starting with coef[n-1]; the last one is P(x_predict).
+    """
+    kernel = get_kernel('horner_steps', len(coef))
+    if kernel is not None:
+        import numpy as np
+        steps = np.empty(len(coef))
+        kernel(np.array(x_data, dtype=np.float64), np.array(coef, dtype=np.float64), float(x_predict), steps)
+        return steps.tolist()
+    return newton_horner_steps_reference(x_data, coef, x_predict)
+
+
+def newton_horner_steps_reference(x_data: List[float], coef: List[float], x_predict: float) -> List[float]:
+    """Pure-Python reference for newton_horner_steps (also the fallback)."""
+    n = len(coef)
 
     # 3. Use Newton's form to evaluate the polynomial at x_predict
     # P(x) = c_0 + c_1(x-x_0) + c_2(x-x_0)(x-x_1) + ...
-    
-    P_x = coef[n-1]
-    
+    steps = [coef[n-1]]
+
     # Horner's method for efficient evaluation
     for i in range(n - 2, -1, -1):
-        P_x = P_x * (x_predict - x_data[i]) + coef[i]
-        
-    return P_x
\ No newline at end of file
+        steps.append(steps[-1] * (x_predict - x_data[i]) + coef[i])
+
+    return steps
+
+
+def newton_horner_reference(x_data: List[float], coef: List[float], x_predict: float) -> float:
+    """Pure-Python reference Horner evaluation of a Newton-form polynomial."""
+    return newton_horner_steps_reference(x_data, coef, x_predict)[-1]
+
+
+def newton_evaluate(x_data: List[float], coef: List[float], x_targets) -> 'np.ndarray':
+    """
+    Evaluates a Newton-form polynomial at many targets with a vectorized Horner scheme.
+
+    Args:
+        x_data: The nodes x0..x_{n-1} the coefficients were built on.
+        coef: Newton coefficients as returned by divided_difference_coefficients.
+        x_targets: Sequence of x-values at which to evaluate the polynomial.
+
+    Returns:
+        An array of polynomial values, one per target.
+    """
+    import numpy as np
+
+    t = np.asarray(x_targets, dtype=float)
+    n = len(coef)
+    P_x = np.full(t.shape, coef[n-1], dtype=float)
+    for i in range(n - 2, -1, -1):
+        P_x = P_x * (t - x_data[i]) + coef[i]
+    return P_x
+
+
+def divided_difference_interpolation_many(x_data: List[float], y_data: List[float], x_targets) -> 'np.ndarray':
+    """
+    Vectorized Divided Difference extrapolation of several targets sharing one data subset.
+    The coefficient table is built once and reused for every target.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+        x_targets: Sequence of x-values for which to predict y.
+
+    Returns:
+        An array of predicted y-values, one per target.
+    """
+    x_nodes = [float(x) for x in x_data]
+    coef = divided_difference_coefficients(x_nodes, [float(y) for y in y_data])
+    return newton_evaluate(x_nodes, coef, x_targets)
+
+
+def divided_difference_coefficient_columns(x_data: List[float], y_columns) -> 'np.ndarray':
+    """
+    Builds the Newton coefficients of several y-series sampled on the same nodes.
+    The divided difference table is computed for all series at once.
+
+    Args:
+        x_data: List of x-coordinates (time) shared by the series.
+        y_columns: An (n, K) array with one series per column.
+
+    Returns:
+        An (n, K) array; column c holds the coefficients of series c.
+    """
+    import numpy as np
+
+    x = np.asarray(x_data, dtype=float)
+    coef = np.array(y_columns, dtype=float).reshape(len(x), -1)
+    n = len(x)
+    if n < 2:
+        raise ValueError(f"Divided Difference method requires a minimum of 2 points. Got {n}.")
+
+    for i in range(1, n):
+        # f[x_j, ..., x_{j-i}] = (f[x_j, ...] - f[x_{j-1}, ...]) / (x_j - x_{j-i}) for all j >= i
+        denominators = x[i:] - x[:n-i]
+        if np.any(denominators == 0):
+            raise ValueError("Error: Divided difference method detected identical x-values.")
+        coef[i:] = (coef[i:] - coef[i-1:n-1]) / denominators[:, None]
+    return coef
+
+
+def divided_difference_interpolation_columns(x_data: List[float], y_columns, x_targets) -> 'np.ndarray':
+    """
+    Divided Difference extrapolation of several y-series sharing one data subset.
+    The Newton products depend only on the nodes, so they are built once and
+    applied to every series' coefficients in one matrix product.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_columns: An (n, K) array with one series per column.
+        x_targets: Sequence of x-values for which to predict.
+
+    Returns:
+        A (len(x_targets), K) array of predicted values.
+    """
+    coef = divided_difference_coefficient_columns(x_data, y_columns)
+    return newton_products(x_data, x_targets, len(coef)).T @ coef
+
+
+def newton_products(x_data: List[float], x_targets, n: int) -> 'np.ndarray':
+    """
+    Evaluates the Newton basis products (x - x_0)...(x - x_{j-1}), j = 0..n-1, at many targets.
+
+    Args:
+        x_data: The nodes x0..x_{n-2} (further nodes are ignored).
+        x_targets: Sequence of x-values at which to evaluate the products.
+        n: Number of products (the number of Newton terms).
+
+    Returns:
+        An (n, len(x_targets)) array; row j holds the j-th product (row 0 is all ones).
+    """
+    import numpy as np
+
+    t = np.asarray(x_targets, dtype=float).reshape(-1)
+    # products[j] = (t - x_0)...(t - x_{j-1}), built as one cumulative product
+    factors = np.ones((n, len(t)))
+    factors[1:] = t[None, :] - np.asarray(x_data[:n-1], dtype=float)[:, None]
+    return np.cumprod(factors, axis=0)
+
+
+def newton_terms(x_data: List[float], coef: List[float], x_targets) -> 'np.ndarray':
+    """
+    Evaluates the individual Newton terms c_j * (x - x_0)...(x - x_{j-1}) at many targets.
+    Their sum is the polynomial; partial sums are the interpolants through the first nodes.
+
+    Args:
+        x_data: The nodes x0..x_{n-1} the coefficients were built on.
+        coef: Newton coefficients as returned by divided_difference_coefficients.
+        x_targets: Sequence of x-values at which to evaluate the terms.
+
+    Returns:
+        An (n, len(x_targets)) array; row j holds the j-th term.
+    """
+    import numpy as np
+
+    return np.asarray(coef, dtype=float)[:, None] * newton_products(x_data, x_targets, len(coef))
+
+
+def newton_fit(x_data: List[float], y_data: List[float]) -> Dict[str, Any]:
+    """
+    Builds the Newton form of the interpolant through the given nodes, over x
+    centred and scaled onto [-1, 1] to stay well conditioned.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+
+    Returns:
+        A dict with 'x' (the scaled nodes), 'coef', 'centre' and 'scale'.
+    """
+    x_nodes = [float(x) for x in x_data]
+    centre = 0.5 * (max(x_nodes) + min(x_nodes))
+    scale = 0.5 * (max(x_nodes) - min(x_nodes)) or 1.0
+    scaled_x = [(x - centre) / scale for x in x_nodes]
+    return {
+        'x': scaled_x,
+        'coef': divided_difference_coefficients(scaled_x, [float(y) for y in y_data]),
+        'centre': centre,
+        'scale': scale
+    }
+
+
+def newton_remainder_evaluate(fit: Dict[str, Any], x_targets, x_reserve=None, y_reserve=None):
+    """
+    Evaluates a Newton fit at many targets and estimates the truncation error
+    from the next-order divided difference, from the same Newton products.
+
+    The error of the interpolant P through nodes x0..x_{n-1} is approximated by the
+    Newton remainder term f[x0,...,x_{n-1},r] * w(x), w(x) = (x - x0)...(x - x_{n-1}),
+    i.e. by how much a held-back reserve node r would move the curve. Since
+    y_r = P(r) + f[x0,...,x_{n-1},r] * w(r), each target's own reserve node costs
+    one more evaluation, batched with the targets; the fit is never rebuilt.
+
+    Args:
+        fit: A Newton fit as returned by newton_fit.
+        x_targets: Sequence of x-values to predict.
+        x_reserve: Reserve node x-value, one per target (or one for all). Without
+                   reserve nodes the band is the magnitude of the fit's own last
+                   term (a conservative proxy).
+        y_reserve: Values at the reserve nodes.
+
+    Returns:
+        A tuple (predicted values, uncertainty half-widths) of arrays.
+    """
+    import numpy as np
+
+    centre, scale = fit['centre'], fit['scale']
+    coef = np.asarray(fit['coef'], dtype=float)
+    n = len(coef)
+    t = (np.asarray(x_targets, dtype=float).reshape(-1) - centre) / scale
+    if x_reserve is None:
+        terms = coef[:, None] * newton_products(fit['x'], t, n)
+        return terms.sum(axis=0), np.abs(terms[-1])
+
+    m = len(t)
+    # Targets and their reserve nodes evaluated together: columns m.. are the reserves
+    points = np.empty(2 * m)
+    points[:m] = t
+    points[m:] = (np.asarray(x_reserve, dtype=float) - centre) / scale
+    products = newton_products(fit['x'], points, n + 1)
+    values = coef @ products[:n]
+    top = (y_reserve - values[m:]) / products[n, m:]
+    return values[:m], np.abs(top * products[n, :m])
+
+
+def newton_remainder_columns(x_data: List[float], y_columns, x_targets, x_reserve=None, y_reserve=None):
+    """
+    Column form of newton_fit and newton_remainder_evaluate for several y-series
+    sharing the nodes: one scaled Newton fit for all series, and the estimate
+    and band of every series from the same Newton products, which are computed
+    once for all series.
+
+    Args:
+        x_data: Nodes shared by the series.
+        y_columns: An (n, K) array with one series per column.
+        x_targets: Sequence of x-values to predict.
+        x_reserve: Reserve node x-value, one per target (or one for all); None
+                   uses the magnitude of the fit's own last term as the band.
+        y_reserve: Values at the reserve nodes, (len(x_targets), K).
+
+    Returns:
+        A tuple (predicted values, uncertainty half-widths), both (len(x_targets), K) arrays.
+    """
+    import numpy as np
+
+    x = np.asarray(x_data, dtype=float)
+    centre = 0.5 * (x.max() + x.min())
+    scale = 0.5 * (x.max() - x.min()) or 1.0
+    s = (x - centre) / scale
+    coef = divided_difference_coefficient_columns(s, y_columns)
+    n = len(coef)
+    t = (np.asarray(x_targets, dtype=float).reshape(-1) - centre) / scale
+    if x_reserve is None:
+        products = newton_products(s, t, n)
+        return products.T @ coef, np.abs(products[-1][:, None] * coef[-1][None, :])
+
+    m = len(t)
+    points = np.empty(2 * m)
+    points[:m] = t
+    points[m:] = (np.asarray(x_reserve, dtype=float) - centre) / scale
+    products = newton_products(s, points, n + 1)
+    values = products[:n].T @ coef
+    top = (np.asarray(y_reserve, dtype=float).reshape(m, -1) - values[m:]) / products[n, m:, None]
+    return values[:m], np.abs(top * products[n, :m, None])
+
+
+class NewtonTable:
+    """
+    Persistent divided-difference table for a sliding window of samples.
+
+    The Newton form is anchored at the newest node: nodes are kept newest first
+    and coef[j] = f[x_new, ..., x_{new-j}] is the table's last diagonal. Appending
+    a sample builds the new diagonal from the old one in O(n); dropping the oldest
+    sample just removes the last term, because the Newton form through the other
+    nodes is its truncation. Sliding-window prediction is therefore O(n) per step
+    instead of rebuilding the O(n^2) table.
+    """
+
+    def __init__(self, max_points: Optional[int] = None):
+        if max_points is not None and max_points < 2:
+            raise ValueError(f"Divided Difference method requires a minimum of 2 points. Got {max_points}.")
+        self.max_points = max_points
+        self.nodes: Deque[float] = deque()
+        # y-value of each node, in the same (newest-first) order
+        self.values: Deque[float] = deque()
+        self.coef: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def append(self, x: float, y: float):
+        """
+        Adds a sample as the newest node, evicting the oldest one when max_points is exceeded.
+
+        Args:
+            x: The x-coordinate (time) of the sample.
+            y: The y-coordinate (value) of the sample.
+        """
+        diagonal = [y]
+        for j, node in enumerate(self.nodes):
+            denominator = x - node
+            if denominator == 0:
+                raise ValueError("Error: Divided difference method detected identical x-values.")
+            # f[x, a_1, ..., a_{j+1}] = (f[x, a_1, ..., a_j] - f[a_1, ..., a_{j+1}]) / (x - a_{j+1})
+            diagonal.append((diagonal[j] - self.coef[j]) / denominator)
+        self.nodes.appendleft(x)
+        self.values.appendleft(y)
+        self.coef = diagonal
+        if self.max_points is not None and len(self.nodes) > self.max_points:
+            self.drop_oldest()
+
+    def drop_oldest(self):
+        """Removes the oldest node (the last Newton term) in O(1)."""
+        if not self.nodes:
+            raise ValueError("Cannot drop a point from an empty table.")
+        self.nodes.pop()
+        self.values.pop()
+        self.coef.pop()
+
+    def evaluate(self, x_predict: float) -> float:
+        """Evaluates the interpolant through the current nodes at x_predict (Horner, O(n))."""
+        n = len(self.coef)
+        if n < 2:
+            raise ValueError(f"Divided Difference method requires a minimum of 2 points. Got {n}.")
+        P_x = self.coef[n-1]
+        for i in range(n - 2, -1, -1):
+            P_x = P_x * (x_predict - self.nodes[i]) + self.coef[i]
+        return P_x
+
+    def evaluate_many(self, x_targets) -> 'np.ndarray':
+        """Vectorized evaluation of the interpolant at many targets."""
+        if len(self.coef) < 2:
+            raise ValueError(f"Divided Difference method requires a minimum of 2 points. Got {len(self.coef)}.")
+        return newton_evaluate(list(self.nodes), self.coef, x_targets)
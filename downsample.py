@@ -0,0 +1,157 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Each pyramid level keeps about 1/LEVEL_FACTOR of the samples of the level below
+LEVEL_FACTOR = 4
+
+# A level is fine enough for a view when it has at most this many samples per pixel
+SAMPLES_PER_PIXEL = 8
+
+# Number of recent views kept by DownsamplePyramid.view
+VIEW_CACHE_SIZE = 32
+
+
+def lttb_indices(x_values, y_values, threshold: int) -> 'np.ndarray':
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    The first and last samples are kept; the others are split into threshold - 2
+    equal-count buckets, and each bucket keeps the sample forming the largest
+    triangle with the previously kept sample and the average of the next bucket.
+
+    Args:
+        x_values: x-coordinates, sorted ascending.
+        y_values: y-coordinates.
+        threshold: Number of samples to keep.
+
+    Returns:
+        Ascending indices of the kept samples (all indices if threshold >= len(x) or < 3).
+    """
+    import numpy as np
+
+    x = np.asarray(x_values, dtype=float)
+    y = np.asarray(y_values, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket i covers [edges[i], edges[i+1]); with threshold < n every bucket is non-empty
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n-1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n-1], edges[:-1] - 1) / counts
+    # The bucket after the last one is the final sample
+    avg_x = np.r_[avg_x[1:], x[-1]]
+    avg_y = np.r_[avg_y[1:], y[-1]]
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i+1]
+        bx, by = x[start:end], y[start:end]
+        # Twice the triangle area (a, candidate, next-bucket average)
+        area = np.abs((x[a] - avg_x[i]) * (by - y[a]) - (x[a] - bx) * (avg_y[i] - y[a]))
+        a = start + int(area.argmax())
+        selected[i+1] = a
+    return selected
+
+
+def minmax_indices(x_values, y_values, num_bins: int) -> 'np.ndarray':
+    """
+    Min/max decimation: keeps the lowest and highest sample of each of num_bins
+    equal-count bins, so spikes survive at any zoom level.
+
+    Args:
+        x_values: x-coordinates, sorted ascending.
+        y_values: y-coordinates.
+        num_bins: Number of bins; at most 2 * num_bins + 2 samples are kept.
+
+    Returns:
+        Ascending indices of the kept samples, including the first and last.
+    """
+    import numpy as np
+
+    y = np.asarray(y_values, dtype=float)
+    n = len(y)
+    if num_bins < 1 or 2 * num_bins >= n:
+        return np.arange(n)
+
+    size = n // num_bins
+    blocks = y[:size * num_bins].reshape(num_bins, size)
+    base = np.arange(num_bins) * size
+    kept = np.concatenate([
+        base + blocks.argmin(axis=1),
+        base + blocks.argmax(axis=1),
+        [0, n - 1]
+    ])
+    # The tail that does not fill a whole bin keeps its extremes too
+    if size * num_bins < n:
+        tail = y[size * num_bins:]
+        kept = np.r_[kept, size * num_bins + tail.argmin(), size * num_bins + tail.argmax()]
+    return np.unique(kept)
+
+
+class DownsamplePyramid:
+    """
+    Cached multi-resolution copy of a long series for plotting.
+
+    Level 0 is the full series sorted by x; each coarser level is the min/max
+    decimation of the one below, about LEVEL_FACTOR times smaller. A view picks
+    the finest level with at most SAMPLES_PER_PIXEL samples per pixel inside the
+    visible range and reduces that slice to the pixel width with LTTB, so pan
+    and zoom cost O(width) regardless of the history length. Recent views are cached.
+    """
+
+    def __init__(self, x_values, y_values, min_points: int = 4096):
+        import numpy as np
+
+        x = np.asarray(x_values, dtype=float)
+        y = np.asarray(y_values, dtype=float)
+        order = np.argsort(x, kind='stable')
+        self.levels: List[Tuple['np.ndarray', 'np.ndarray']] = [(x[order], y[order])]
+        while len(self.levels[-1][0]) > min_points:
+            lx, ly = self.levels[-1]
+            kept = minmax_indices(lx, ly, len(lx) // (2 * LEVEL_FACTOR))
+            self.levels.append((lx[kept], ly[kept]))
+        self._views: 'OrderedDict[Tuple[float, float, int], Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.levels[0][0])
+
+    def view(self, x_min: float, x_max: float, width: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Returns at most `width` samples representing the series on [x_min, x_max].
+
+        Args:
+            x_min: Left edge of the visible range.
+            x_max: Right edge of the visible range.
+            width: Width of the plot area in pixels.
+
+        Returns:
+            A tuple (x, y) of arrays, sorted by x. One sample beyond each edge is
+            included, so lines run off the plot area instead of stopping short.
+        """
+        import numpy as np
+
+        key = (float(x_min), float(x_max), int(width))
+        cached = self._views.get(key)
+        if cached is not None:
+            self._views.move_to_end(key)
+            return cached
+
+        budget = SAMPLES_PER_PIXEL * max(width, 1)
+        for lx, ly in self.levels:
+            start = max(int(np.searchsorted(lx, x_min, side='left')) - 1, 0)
+            stop = min(int(np.searchsorted(lx, x_max, side='right')) + 1, len(lx))
+            if stop - start <= budget:
+                break
+        kept = lttb_indices(lx[start:stop], ly[start:stop], max(width, 3))
+        result = (lx[start:stop][kept], ly[start:stop][kept])
+
+        self._views[key] = result
+        if len(self._views) > VIEW_CACHE_SIZE:
+            self._views.popitem(last=False)
+        return result
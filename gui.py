@@ -12,19 +12,39 @@ from kivy.uix.label import Label
 from kivy.uix.image import Image
 from kivy.core.window import Window
 from kivy.graphics import Color, RoundedRectangle
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')
-from matplotlib.backends.backend_agg import FigureCanvasAgg
 from kivy.core.image import Image as CoreImage
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
 import io
-from home import SmartTrendExtrapolator
+from trendCore import SmartTrendCore
+from koiRisk import RISK_LEVELS, THRESHOLD_LINES
+from sensitivity import write_sensitivity_csv
 import os
 import json
 import csv
+import glob
+import time
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.anchorlayout import AnchorLayout
 
+# Seconds without further edits before live mode recalculates
+LIVE_DEBOUNCE = 0.3
+
+# Horizon columns of the sensitivity heatmap, evenly spaced up to the entered horizon
+SENSITIVITY_HORIZONS = 12
+
+# Extrapolation plot navigation: pan step (fraction of the visible range) and zoom factor
+PLOT_PAN_FRACTION = 0.5
+PLOT_ZOOM_FACTOR = 2.0
+
+def load_pyplot():
+    """Imports matplotlib on the first plot, so the GUI starts without loading it."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
 class RoundedButton(Button):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -60,11 +80,20 @@ class BorderedLabel(Label):
 class SmartTrendGUI(App):
     def __init__(self):
         super().__init__()
-        self.extrapolator = SmartTrendExtrapolator()
+        self.extrapolator = SmartTrendCore()
         self.data_points = []
         self.current_method = 'Lagrange'
         self.last_pred = None
         self.last_interpretation = None
+        self.last_sensitivity = None
+        # Visible x-range of the extrapolation plot; None focuses on the subset and forecast
+        self.plot_view = None
+        # Live mode: edits gathered during the debounce window, applied in one update
+        self.live_mode = False
+        self.live_pending = []
+        self.live_rebuild = False
+        self.live_figure = None
+        self.live_trigger = Clock.create_trigger(self.live_update, LIVE_DEBOUNCE)
         self.sm = ScreenManager()
 
     def build(self):
@@ -234,10 +263,18 @@ class SmartTrendGUI(App):
         self.num_points.bind(on_text_validate=self.calculate)
         self.num_points._next_widget = self.horizon_input
         self.num_points.keyboard_on_key_down = lambda w, k, t, m: self.handle_tab(self.num_points, w, k, t, m)
+        self.horizon_input.bind(text=self.schedule_live_update)
+        self.num_points.bind(text=self.schedule_live_update)
         
         find_card.add_widget(Label(text='', size_hint_y=1))
-        calc_btn = RoundedButton(text='Calculate', size_hint_y=None, height=50, on_press=self.calculate)
-        find_card.add_widget(calc_btn)
+        calc_row = BoxLayout(orientation='horizontal', size_hint_y=None, height=50, spacing=10)
+        calc_btn = RoundedButton(text='Calculate', on_press=self.calculate)
+        calc_row.add_widget(calc_btn)
+        self.live_btn = RoundedButton(text='Live: Off', size_hint_x=0.6, on_press=self.toggle_live)
+        calc_row.add_widget(self.live_btn)
+        sensitivity_btn = RoundedButton(text='Sensitivity', size_hint_x=0.6, on_press=self.show_sensitivity)
+        calc_row.add_widget(sensitivity_btn)
+        find_card.add_widget(calc_row)
         
         cards.add_widget(find_card)
         
@@ -334,6 +371,11 @@ class SmartTrendGUI(App):
         plot_card.add_widget(Label(text='Extrapolation Plot', font_size='16sp', size_hint_y=None, height=30, bold=True, font_name='Roboto', color=(0.9, 1, 0.9, 1)))
         self.plot_image = Image(size_hint=(1, 1))
         plot_card.add_widget(self.plot_image)
+        # Pan and zoom along x; each step redraws the history from the pyramid level for that range
+        nav_row = BoxLayout(orientation='horizontal', size_hint_y=None, height=36, spacing=6)
+        for text, action in (('<', 'left'), ('-', 'out'), ('Fit', 'fit'), ('+', 'in'), ('>', 'right')):
+            nav_row.add_widget(RoundedButton(text=text, on_press=lambda inst, a=action: self.navigate_plot(a)))
+        plot_card.add_widget(nav_row)
         
         # Interpretation Card (separate square to the right)
         interp_card = BoxLayout(orientation='vertical', padding=15, spacing=10, size_hint_x=0.3)
@@ -368,6 +410,14 @@ class SmartTrendGUI(App):
         export_row = BoxLayout(orientation='horizontal', size_hint_y=None, height=50, padding=[0, 0, 0, 0], spacing=10)
         export_btn = RoundedButton(text='Export Results', on_press=self.export_all)
         export_row.add_widget(export_btn)
+        save_btn = RoundedButton(text='Save Session', size_hint_x=0.5, on_press=self.save_session)
+        export_row.add_widget(save_btn)
+        load_btn = RoundedButton(text='Load Session', size_hint_x=0.5, on_press=self.load_session)
+        export_row.add_widget(load_btn)
+        self.metrics_btn = RoundedButton(text='Metrics: Off', size_hint_x=0.4, on_press=self.toggle_metrics)
+        export_row.add_widget(self.metrics_btn)
+        self.profile_btn = RoundedButton(text='Profile: Off', size_hint_x=0.4, on_press=self.toggle_profiling)
+        export_row.add_widget(self.profile_btn)
         content.add_widget(export_row)
         
         # Status
@@ -450,10 +500,63 @@ class SmartTrendGUI(App):
         if self.current_method == 'Lagrange':
             self.current_method = 'Divided Difference'
             self.method_btn.text = 'Divided Difference'
+        elif self.current_method == 'Divided Difference':
+            self.current_method = 'Chebyshev'
+            self.method_btn.text = 'Chebyshev'
+        elif self.current_method == 'Chebyshev':
+            self.current_method = 'Auto'
+            self.method_btn.text = 'Auto'
         else:
             self.current_method = 'Lagrange'
             self.method_btn.text = 'Lagrange'
     
+    def toggle_metrics(self, instance):
+        metrics = self.extrapolator.metrics
+        if metrics.enabled:
+            metrics.disable()
+            self.metrics_btn.text = 'Metrics: Off'
+        else:
+            metrics.reset()
+            metrics.enable()
+            self.metrics_btn.text = 'Metrics: On'
+
+    def toggle_profiling(self, instance):
+        """Starts a cProfile/tracemalloc session, or stops it and writes its report under exports."""
+        metrics = self.extrapolator.metrics
+        if not metrics.profiling:
+            metrics.start_profiling()
+            self.profile_btn.text = 'Profile: On'
+            self.result_label.text = 'Profiling started; press Profile again to write the report'
+            return
+        self.profile_btn.text = 'Profile: Off'
+        report = metrics.stop_profiling()
+        try:
+            export_dir = os.path.join(os.getcwd(), 'exports')
+            os.makedirs(export_dir, exist_ok=True)
+            report_path = os.path.join(export_dir, f"profile_{time.strftime('%Y%m%d_%H%M%S')}.txt")
+            with open(report_path, 'w', encoding='utf-8') as f:
+                f.write(report)
+            self.result_label.text = f'Profile written to {report_path}'
+        except Exception as e:
+            self.result_label.text = f'Error: {str(e)}'
+
+    def toggle_live(self, instance):
+        self.live_mode = not self.live_mode
+        self.live_btn.text = 'Live: On' if self.live_mode else 'Live: Off'
+        if self.live_mode:
+            self.live_rebuild = True
+            self.schedule_live_update()
+        else:
+            self.live_trigger.cancel()
+            self.live_pending = []
+            self.close_live_figure()
+
+    def schedule_live_update(self, *args):
+        """Restarts the debounce timer, so a burst of edits triggers a single update."""
+        if self.live_mode:
+            self.live_trigger.cancel()
+            self.live_trigger()
+
     def add_point(self, instance):
         try:
             x = float(self.x_input.text)
@@ -462,6 +565,9 @@ class SmartTrendGUI(App):
                 self.result_label.text = 'Error: DO must be between 0-20 mg/L'
                 return
             self.data_points.append((x, y))
+            if self.live_mode:
+                self.live_pending.append((x, y))
+                self.schedule_live_update()
             self.update_table()
             self.result_label.text = f'Added: ({x}, {y}) | Total Points: {len(self.data_points)}'
             self.x_input.text = ''
@@ -476,6 +582,8 @@ class SmartTrendGUI(App):
             y = float(self.y_input.text)
             if (x, y) in self.data_points:
                 self.data_points.remove((x, y))
+                self.live_rebuild = True
+                self.schedule_live_update()
                 self.update_table()
                 self.result_label.text = f'Deleted: ({x}, {y}) | Total Points: {len(self.data_points)}'
             else:
@@ -506,95 +614,369 @@ class SmartTrendGUI(App):
             
             if self.extrapolator.predictions:
                 pred = self.extrapolator.predictions[-1]
-                self.last_pred = pred
-                self.result_x_label.text = f"{self.x_title.text} = {pred['x']:.4f}"
-                self.result_y_label.text = f"{self.y_title.text} = {pred['y']:.4f}"
+                self.show_prediction(pred)
+                self.plot_view = None
                 self.result_label.text = f"Calculation complete using {pred['method']} method"
-                risk = pred.get('risk', {})
-                hex_color = risk.get('color', '#FFFFFF')
-                to_rgba = lambda h: tuple(int(h[i:i+2], 16) / 255 for i in (1, 3, 5)) + (1,)
-                self.risk_label.color = to_rgba(hex_color)
-                self.risk_label.text = (
-                    f"Risk: {risk.get('status', 'N/A')}\n"
-                    f"{risk.get('message', '')}\n"
-                    f"Action: {risk.get('action', '')}"
-                )
-                # Interpretation
-                latest_x = max(self.data_points, key=lambda p: p[0])[0]
-                latest_y = [p[1] for p in self.data_points if p[0] == latest_x][0]
-                interp = self.extrapolator.generate_interpretation(latest_x, latest_y, pred['x'], pred['y'])
-                self.last_interpretation = interp
-                self.interpretation_label.text = interp
+                if 'condition_number' in pred:
+                    self.result_label.text += f" (condition number {pred['condition_number']:.2e})"
                 # Plot the data with highlighted prediction point
                 self.plot_data(target_x, pred['y'])
         except Exception as e:
             self.result_label.text = f'Error: {str(e)}'
 
+    def show_prediction(self, pred):
+        """Fills the result, risk and interpretation cards from a prediction record."""
+        self.last_pred = pred
+        self.result_x_label.text = f"{self.x_title.text} = {pred['x']:.4f}"
+        self.result_y_label.text = f"{self.y_title.text} = {pred['y']:.4f}"
+        if 'uncertainty' in pred:
+            self.result_y_label.text += f" +/- {pred['uncertainty']:.4f}"
+        risk = pred.get('risk', {})
+        hex_color = risk.get('color', '#FFFFFF')
+        to_rgba = lambda h: tuple(int(h[i:i+2], 16) / 255 for i in (1, 3, 5)) + (1,)
+        self.risk_label.color = to_rgba(hex_color)
+        self.risk_label.text = (
+            f"Risk: {risk.get('status', 'N/A')}\n"
+            f"{risk.get('message', '')}\n"
+            f"Action: {risk.get('action', '')}"
+        )
+        # Interpretation
+        latest_x = max(self.data_points, key=lambda p: p[0])[0]
+        latest_y = [p[1] for p in self.data_points if p[0] == latest_x][0]
+        interp = self.extrapolator.generate_interpretation(latest_x, latest_y, pred['x'], pred['y'])
+        self.last_interpretation = interp
+        self.interpretation_label.text = interp
+
+    def live_update(self, *args):
+        """
+        Applies the edits gathered during the debounce window. New points are fed to
+        the live model one by one (O(num_points) each); deletions and enabling live
+        mode rebuild it. Only the data and curve artists of the plot are redrawn.
+        """
+        try:
+            horizon = float(self.horizon_input.text)
+            num_points = int(self.num_points.text)
+        except ValueError:
+            return  # Inputs are still being typed
+        if len(self.data_points) < 2:
+            self.result_label.text = 'Live: need at least 2 data points'
+            return
+        core = self.extrapolator
+        pending, self.live_pending = self.live_pending, []
+        try:
+            with core.metrics.stage('live_update'):
+                if self.live_rebuild:
+                    core.collect_data_points(self.data_points)
+                else:
+                    for x, y in pending:
+                        core.add_live_point(x, y)
+                core.set_configuration(self.x_title.text, self.y_title.text, self.current_method, num_points, None)
+                if self.live_rebuild:
+                    core.reset_live_model()
+                    self.live_rebuild = False
+                pred = core.live_predict(horizon)
+                pred['solution'] = 'Live preview: press Calculate for the step-by-step solution.'
+                self.show_prediction(pred)
+                self.update_live_plot(pred)
+            self.result_label.text = f"Live update from the {pred['subset_size']} latest points"
+        except Exception as e:
+            self.live_rebuild = True
+            self.result_label.text = f'Error: {str(e)}'
+
+    def create_live_figure(self):
+        """Builds the persistent live figure once; later updates only move its artists."""
+        plt = load_pyplot()
+        fig, ax = plt.subplots(figsize=(8, 4))
+        thresholds = self.extrapolator.config['risk_thresholds']
+        for threshold, line in reversed(list(zip(thresholds, THRESHOLD_LINES))):
+            ax.axhline(y=threshold, color=line['color'], linestyle=line['linestyle'],
+                       label=f"{line['label']} ({threshold})", zorder=1)
+        live = {
+            'fig': fig,
+            'ax': ax,
+            'points': ax.scatter([], [], color='blue', s=100, label='Data Points', zorder=3),
+            'curve': ax.plot([], [], 'g-', linewidth=2, label='Extrapolation Trend')[0],
+            'now': ax.axvline(x=0, color='gray', linestyle='--', label='Current Time', zorder=2),
+            'target': ax.scatter([], [], color='red', s=200, marker='*', label='Predicted Point', zorder=5),
+            'band': None,
+            'texture': None
+        }
+        ax.set_title('Live Extrapolation', fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='upper left', fontsize=8)
+        fig.tight_layout()
+        return live
+
+    def update_live_plot(self, pred):
+        """Moves the live artists to the current subset, curve and prediction, then re-blits the figure."""
+        import numpy as np
+
+        live = self.live_figure
+        if live is None:
+            live = self.live_figure = self.create_live_figure()
+        ax = live['ax']
+        ax.set_xlabel(self.x_title.text, fontsize=12)
+        ax.set_ylabel(self.y_title.text, fontsize=12)
+        core = self.extrapolator
+        lookup = dict(self.data_points)
+        x_vals = list(core.live_table.nodes)[:pred['subset_size']]
+        y_vals = [lookup.get(x, np.nan) for x in x_vals]
+        x_range = np.linspace(min(x_vals), pred['x'], 100)
+        y_range, band = core.evaluate_live(x_range)
+
+        live['points'].set_offsets(np.column_stack([x_vals, y_vals]))
+        live['curve'].set_data(x_range, y_range)
+        live['now'].set_xdata([x_vals[0], x_vals[0]])
+        live['target'].set_offsets([[pred['x'], pred['y']]])
+        if live['band'] is not None:
+            live['band'].remove()
+        live['band'] = ax.fill_between(x_range, y_range - band, y_range + band, color='green', alpha=0.2, zorder=1)
+
+        # Axis limits from the artists' data; scatter collections are not covered by relim()
+        thresholds = self.extrapolator.config['risk_thresholds']
+        low = np.nanmin(np.concatenate([y_range - band, y_vals, thresholds]))
+        high = np.nanmax(np.concatenate([y_range + band, y_vals, thresholds]))
+        x_pad = 0.05 * (pred['x'] - min(x_vals)) or 1.0
+        y_pad = 0.05 * (high - low) or 1.0
+        ax.set_xlim(min(x_vals) - x_pad, pred['x'] + x_pad)
+        ax.set_ylim(low - y_pad, high + y_pad)
+
+        # Blit the Agg buffer straight into a reused texture, skipping PNG encoding
+        canvas = live['fig'].canvas
+        canvas.draw()
+        width, height = canvas.get_width_height()
+        texture = live['texture']
+        if texture is None or texture.size != (width, height):
+            texture = live['texture'] = Texture.create(size=(width, height), colorfmt='rgba')
+            texture.flip_vertical()
+        texture.blit_buffer(bytes(canvas.buffer_rgba()), colorfmt='rgba', bufferfmt='ubyte')
+        self.plot_image.texture = texture
+        self.plot_image.canvas.ask_update()
+
+    def close_live_figure(self):
+        if self.live_figure is not None:
+            load_pyplot().close(self.live_figure['fig'])
+            self.live_figure = None
+
+    def show_sensitivity(self, instance):
+        """Sweeps subset size x horizon in one batched pass and shows the risk heatmap."""
+        import numpy as np
+        try:
+            if len(self.data_points) < 2:
+                self.result_label.text = 'Error: Need at least 2 data points'
+                return
+            horizon = float(self.horizon_input.text)
+            core = self.extrapolator
+            core.collect_data_points(self.data_points)
+            horizons = np.linspace(horizon / SENSITIVITY_HORIZONS, horizon, SENSITIVITY_HORIZONS)
+            grid = core.sensitivity_grid(horizons)
+            with core.metrics.stage('plot'):
+                self._render_sensitivity(grid)
+            self.last_sensitivity = grid
+            self.result_label.text = (
+                f"Sensitivity: {len(grid['sizes'])} subset sizes x {len(horizons)} horizons "
+                f"(export to save as CSV)"
+            )
+        except Exception as e:
+            self.result_label.text = f'Error: {str(e)}'
+
+    def _render_sensitivity(self, grid, export_path=None):
+        import numpy as np
+        from matplotlib.colors import BoundaryNorm, ListedColormap
+        from matplotlib.patches import Patch
+        plt = load_pyplot()
+        fig, ax = plt.subplots(figsize=(8, 4))
+
+        # One colour per risk band; cells are labelled with the predicted value
+        cmap = ListedColormap([level['color'] for level in RISK_LEVELS])
+        norm = BoundaryNorm(np.arange(len(RISK_LEVELS) + 1) - 0.5, cmap.N)
+        ax.imshow(grid['risk'], cmap=cmap, norm=norm, aspect='auto', origin='lower')
+        sizes, horizons = grid['sizes'], grid['horizons']
+        for (i, j), y in np.ndenumerate(grid['y']):
+            ax.text(j, i, f'{y:.1f}', ha='center', va='center', fontsize=7)
+        ax.set_xticks(range(len(horizons)))
+        ax.set_xticklabels([f'{h:g}' for h in horizons], fontsize=8)
+        ax.set_yticks(range(len(sizes)))
+        ax.set_yticklabels([str(k) for k in sizes], fontsize=8)
+        ax.set_xlabel(f'Horizon ({self.x_title.text})', fontsize=12)
+        ax.set_ylabel('Subset Size', fontsize=12)
+        ax.set_title(f'{self.y_title.text} Sensitivity by Risk Band', fontsize=14, fontweight='bold')
+        ax.legend(handles=[Patch(color=level['color'], label=level['status']) for level in RISK_LEVELS],
+                  loc='upper left', bbox_to_anchor=(1.01, 1), fontsize=8)
+        fig.tight_layout()
+
+        if export_path:
+            fig.savefig(export_path, format='png', dpi=120)
+        else:
+            buf = io.BytesIO()
+            fig.savefig(buf, format='png', dpi=100)
+            buf.seek(0)
+            self.plot_image.texture = CoreImage(buf, ext='png').texture
+        plt.close(fig)
+
     def export_all(self, instance):
         if not self.last_pred or not self.last_interpretation:
             self.result_label.text = 'Error: No prediction to export. Run Calculate first.'
             return
+        try:
+            export_dir = os.path.join(os.getcwd(), 'exports')
+            os.makedirs(export_dir, exist_ok=True)
+            # TXT summary
+            txt_path = os.path.join(export_dir, 'prediction.txt')
+            r = self.last_pred.get('risk', {})
+            with open(txt_path, 'w', encoding='utf-8') as f:
+                f.write("SmartTrend: Koi DO Predictor - Export Results\n")
+                f.write("=" * 50 + "\n\n")
+                f.write(f"Method: {self.last_pred['method']}\n")
+                f.write(f"Subset Size: {self.last_pred['subset_size']}\n")
+                f.write(f"X ({self.x_title.text}): {self.last_pred['x']:.4f}\n")
+                f.write(f"Y ({self.y_title.text}): {self.last_pred['y']:.4f}\n")
+                f.write(f"Risk: {r.get('status', '')} | {r.get('message', '')} | Action: {r.get('action', '')}\n\n")
+                flagged = [
+                    p for p, flag in zip(self.extrapolator.data_points, self.extrapolator.sample_flags) if flag
+                ]
+                if flagged:
+                    f.write(f"Flagged Outliers ({len(flagged)}): ")
+                    f.write(", ".join(f"({p['x']:.4f}, {p['y']:.4f})" for p in flagged) + "\n\n")
+                f.write("INTERPRETATION:\n")
+                f.write("-" * 50 + "\n")
+                f.write(f"{self.last_interpretation}\n\n")
+                f.write("STEP-BY-STEP SOLUTION:\n")
+                f.write("-" * 50 + "\n")
+                if 'solution' in self.last_pred:
+                    # Streamed line by line; long solutions are never held as one string
+                    self.extrapolator.write_solution(f, self.last_pred)
+                else:
+                    f.write("No solution available.\n")
+            # Graph (PNG/PDF)
+            png_path = os.path.join(export_dir, 'extrapolation_plot.png')
+            pdf_path = os.path.join(export_dir, 'extrapolation_plot.pdf')
+            self.plot_data(self.last_pred['x'], self.last_pred['y'], export_paths={'png': png_path, 'pdf': pdf_path})
+            # Sensitivity grid (CSV and heatmap), when one was computed
+            if self.last_sensitivity is not None:
+                with open(os.path.join(export_dir, 'sensitivity.csv'), 'w', encoding='utf-8', newline='') as f:
+                    write_sensitivity_csv(self.last_sensitivity, f)
+                self._render_sensitivity(self.last_sensitivity, os.path.join(export_dir, 'sensitivity.png'))
+            # Stage metrics (JSON and Prometheus text), when collection is switched on
+            metrics = self.extrapolator.metrics
+            if metrics.enabled:
+                metrics.export(os.path.join(export_dir, 'metrics.json'))
+                metrics.export(os.path.join(export_dir, 'metrics.prom'))
+            self.result_label.text = f'Exported to {export_dir}'
+        except Exception as e:
+            self.result_label.text = f'Error: {str(e)}'
+
+    def save_session(self, instance):
+        if not self.data_points:
+            self.result_label.text = 'Error: No data to save.'
+            return
         export_dir = os.path.join(os.getcwd(), 'exports')
         os.makedirs(export_dir, exist_ok=True)
-        # TXT summary
-        txt_path = os.path.join(export_dir, 'prediction.txt')
-        r = self.last_pred.get('risk', {})
-        solution = self.last_pred.get('solution', 'No solution available.')
-        with open(txt_path, 'w', encoding='utf-8') as f:
-            f.write("SmartTrend: Koi DO Predictor - Export Results\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(f"Method: {self.last_pred['method']}\n")
-            f.write(f"Subset Size: {self.last_pred['subset_size']}\n")
-            f.write(f"X ({self.x_title.text}): {self.last_pred['x']:.4f}\n")
-            f.write(f"Y ({self.y_title.text}): {self.last_pred['y']:.4f}\n")
-            f.write(f"Risk: {r.get('status', '')} | {r.get('message', '')} | Action: {r.get('action', '')}\n\n")
-            f.write("INTERPRETATION:\n")
-            f.write("-" * 50 + "\n")
-            f.write(f"{self.last_interpretation}\n\n")
-            f.write("STEP-BY-STEP SOLUTION:\n")
-            f.write("-" * 50 + "\n")
-            f.write(f"{solution}\n")
-        # Graph (PNG/PDF)
-        png_path = os.path.join(export_dir, 'extrapolation_plot.png')
-        pdf_path = os.path.join(export_dir, 'extrapolation_plot.pdf')
-        self.plot_data(self.last_pred['x'], self.last_pred['y'], export_paths={'png': png_path, 'pdf': pdf_path})
-        self.result_label.text = f'Exported to {export_dir}'
+        # Timestamped, so earlier sessions are kept
+        path = os.path.join(export_dir, time.strftime('session-%Y%m%d-%H%M%S.npz'))
+        try:
+            self.extrapolator.collect_data_points(self.data_points)
+            self.extrapolator.save_session(path)
+            self.result_label.text = f'Session saved to {path}'
+        except Exception as e:
+            self.result_label.text = f'Error: {str(e)}'
+
+    def load_session(self, instance):
+        sessions = sorted(glob.glob(os.path.join(os.getcwd(), 'exports', 'session-*.npz')))
+        if not sessions:
+            self.result_label.text = 'Error: No saved session found in exports.'
+            return
+        core = self.extrapolator
+        try:
+            core.load_session(sessions[-1])
+            self.data_points = [(p['x'], p['y']) for p in core.data_points]
+            config = core.config
+            self.x_title.text = config['x_title']
+            self.y_title.text = config['y_title']
+            self.current_method = self.method_btn.text = config['method']
+            self.num_points.text = str(config['num_points'])
+            self.update_table()
+            self.live_rebuild = True
+            if core.predictions:
+                pred = core.predictions[-1]
+                self.horizon_input.text = f"{pred['x'] - core.get_max_x():g}"
+                core.config['extrapolation_value'] = pred['x']
+                core.select_extrapolation_subset()
+                self.show_prediction(pred)
+                self.plot_view = None
+                self.plot_data(pred['x'], pred['y'])
+            self.result_label.text = f'Loaded {os.path.basename(sessions[-1])}: {len(self.data_points)} points, {len(core.predictions)} predictions'
+        except Exception as e:
+            self.result_label.text = f'Error: {str(e)}'
+
+    def default_plot_view(self, target_x):
+        """The subset and forecast window, with a small margin."""
+        x_vals = [p['x'] for p in self.extrapolator.subset]
+        x_min, x_max = min(x_vals), max(max(x_vals), target_x)
+        pad = 0.05 * (x_max - x_min) or 1.0
+        return x_min - pad, x_max + pad
+
+    def navigate_plot(self, action):
+        """Pans or zooms the extrapolation plot along x ('left', 'right', 'in', 'out') or resets it ('fit')."""
+        if self.last_pred is None or not self.extrapolator.subset or self.live_mode:
+            return
+        if action == 'fit':
+            self.plot_view = None
+        else:
+            x_min, x_max = self.plot_view or self.default_plot_view(self.last_pred['x'])
+            span = x_max - x_min
+            if action in ('left', 'right'):
+                shift = PLOT_PAN_FRACTION * span * (1 if action == 'right' else -1)
+                self.plot_view = (x_min + shift, x_max + shift)
+            else:
+                centre = 0.5 * (x_min + x_max)
+                half = 0.5 * span * (PLOT_ZOOM_FACTOR if action == 'out' else 1 / PLOT_ZOOM_FACTOR)
+                self.plot_view = (centre - half, centre + half)
+        try:
+            self.plot_data(self.last_pred['x'], self.last_pred['y'])
+        except Exception as e:
+            self.result_label.text = f'Error: {str(e)}'
 
     def plot_data(self, target_x, target_y, export_paths=None):
+        with self.extrapolator.metrics.stage('plot'):
+            self._render_plot(target_x, target_y, export_paths)
+
+    def _render_plot(self, target_x, target_y, export_paths=None):
+        import numpy as np
+        plt = load_pyplot()
         fig = plt.figure(figsize=(8, 4))
         
-        num_points = int(self.num_points.text)
-        
-        # Get the subset of points used for extrapolation (closest to target_x)
-        sorted_points = sorted(self.data_points, key=lambda p: abs(p[0] - target_x))
-        subset_points = sorted_points[:num_points]
+        core = self.extrapolator
+        num_points = len(core.subset)
         
-        # Plot only the subset points used for extrapolation
-        x_vals = [p[0] for p in subset_points]
-        y_vals = [p[1] for p in subset_points]
+        # The subset of points used for extrapolation (closest to target_x)
+        x_vals = [p['x'] for p in core.subset]
+        y_vals = [p['y'] for p in core.subset]
         max_x = max(x_vals)
         min_x = min(x_vals)
         horizon_value = target_x - max_x
         
+        # History in the visible range only, downsampled to the figure's pixel width;
+        # each pan or zoom (navigate_plot) re-queries the cached pyramid for its range
+        view = self.plot_view or self.default_plot_view(target_x)
+        if len(core.data_points) > num_points:
+            width = int(fig.get_figwidth() * fig.dpi)
+            history_x, history_y = core.history_view(view[0], view[1], width)
+            plt.plot(history_x, history_y, color='#8FA3B8', linewidth=1, alpha=0.8,
+                     label=f'History ({len(core.data_points)} points)', zorder=2)
+        
         plt.scatter(x_vals, y_vals, color='blue', s=100, label=f'Data Points ({num_points} used)', zorder=3)
-        plt.axhline(y=6.0, color='#00FF00', linestyle='--', label='Optimal (6.0)', zorder=1)
-        plt.axhline(y=4.0, color='#FFA500', linestyle='--', label='Caution (4.0)', zorder=1)
-        plt.axhline(y=3.0, color='#FF0000', linestyle='-', label='Critical (3.0)', zorder=1)
+        thresholds = self.extrapolator.config['risk_thresholds']
+        for threshold, line in reversed(list(zip(thresholds, THRESHOLD_LINES))):
+            plt.axhline(y=threshold, color=line['color'], linestyle=line['linestyle'],
+                        label=f"{line['label']} ({threshold})", zorder=1)
         
-        # Plot the extrapolation curve using only the subset
-        import numpy as np
+        # Plot the extrapolation curve and its uncertainty band using only the subset
         x_range = np.linspace(min_x, max_x + horizon_value, 100)
-        y_range = []
-        for x in x_range:
-            self.extrapolator.collect_data_points(subset_points)
-            self.extrapolator.set_configuration(
-                self.x_title.text, self.y_title.text, self.current_method, num_points, x
-            )
-            self.extrapolator.select_extrapolation_subset()
-            self.extrapolator.extrapolate_and_store()
-            if self.extrapolator.predictions:
-                y_range.append(self.extrapolator.predictions[-1]['y'])
+        y_range, band = self.extrapolator.evaluate_with_uncertainty(x_range)
         
+        plt.fill_between(x_range, y_range - band, y_range + band, color='green', alpha=0.2,
+                         label='Uncertainty Band', zorder=1)
         plt.plot(x_range, y_range, 'g-', linewidth=2, label='Extrapolation Trend')
         plt.axvline(x=max_x, color='gray', linestyle='--', label='Current Time', zorder=2)
         
@@ -602,6 +984,7 @@ class SmartTrendGUI(App):
         plt.scatter([target_x], [target_y], color='red', s=200, marker='*', 
                    label=f'Predicted Point ({target_x:.2f}, {target_y:.2f})', zorder=5)
         
+        plt.xlim(*view)
         plt.xlabel(self.x_title.text, fontsize=12)
         plt.ylabel(self.y_title.text, fontsize=12)
         plt.title(f'{self.current_method} Extrapolation', fontsize=14, fontweight='bold')
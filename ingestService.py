@@ -0,0 +1,338 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from dividedDifference import NewtonTable
+from koiRisk import RISK_THRESHOLDS, check_thresholds, koi_risk_code, risk_level
+from outlierFilter import HampelFilter
+
+HTTP_METHODS = (b'GET ', b'POST ', b'HEAD ', b'PUT ')
+
+# Largest request line (line protocol) or HTTP body accepted, about 90,000 readings;
+# also the asyncio stream limit, which otherwise defaults to 64 KiB
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+
+
+def parse_reading(entry: Any) -> Tuple[str, float, float]:
+    """
+    Validates one [sensor_id, x, y] reading from a request.
+
+    Returns:
+        The reading as (sensor id as a string, x, y); ids are stringified the same
+        way prediction requests are, so both look up the same sensor.
+
+    Raises:
+        ValueError: If the entry is not a triple of an id and two finite numbers.
+    """
+    if not isinstance(entry, (list, tuple)) or len(entry) != 3:
+        raise ValueError(f"Expected [sensor_id, x, y], got {entry!r}.")
+    sensor_id, x, y = entry
+    if sensor_id is None or isinstance(sensor_id, (list, dict)):
+        raise ValueError(f"Invalid sensor id: {sensor_id!r}.")
+    for value in (x, y):
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"Reading values must be finite numbers, got {value!r}.")
+    return str(sensor_id), float(x), float(y)
+
+
+class SensorStream:
+    """
+    Streaming extrapolator for a single sensor.
+    Keeps a bounded window of the most recent readings and predicts from the
+    num_points latest of them, held in an incrementally updated Newton table.
+    An optional Hampel filter drops anomalous readings before they reach the window.
+    """
+
+    def __init__(self, num_points: int = 5, window: int = 256, outlier_filter: Optional[HampelFilter] = None):
+        self.num_points = max(2, num_points)
+        self.readings: Deque[Tuple[float, float]] = deque(maxlen=max(window, self.num_points))
+        self.table = NewtonTable(self.num_points)
+        self.outlier_filter = outlier_filter
+
+    def add(self, x: float, y: float) -> bool:
+        """
+        Appends a reading; readings must arrive in increasing x per sensor.
+        
+        Returns:
+            False if the reading was flagged as an outlier and dropped.
+        """
+        if self.readings and x <= self.readings[-1][0]:
+            raise ValueError(f"Out-of-order or duplicate reading at X={x}.")
+        if self.outlier_filter is not None and self.outlier_filter.update(y):
+            return False
+        self.readings.append((x, y))
+        self.table.append(x, y)
+        return True
+
+    def predict(self, horizon: float, thresholds=RISK_THRESHOLDS) -> Dict[str, Any]:
+        """
+        Predicts the value at (latest X + horizon) from the most recent readings.
+
+        Args:
+            horizon: Offset added to the latest reading's x-value.
+            thresholds: Risk thresholds used for the status lookup.
+
+        Returns:
+            A prediction record with x, y, subset_size and risk.
+        """
+        if len(self.readings) < 2:
+            raise ValueError("Not enough data points collected for extrapolation (minimum 2 required).")
+        x_predict = self.readings[-1][0] + horizon
+        y_predicted = self.table.evaluate(x_predict)
+        return {
+            'x': x_predict,
+            'y': y_predicted,
+            'subset_size': len(self.table),
+            'risk': risk_level(koi_risk_code(y_predicted, thresholds))
+        }
+
+
+class IngestService:
+    """
+    asyncio service that ingests batched (sensor_id, x, y) readings and serves predictions.
+
+    Two protocols share one listening socket (TCP or UNIX):
+      - newline-delimited JSON: {"readings": [[id, x, y], ...]} or {"predict": id, "horizon": h}
+      - minimal HTTP/1.1: POST /readings with the same JSON body, GET /predict?sensor=id&horizon=h
+
+    Accepted batches go through a bounded queue. When the consumer falls behind,
+    handlers block on the queue and stop reading their sockets, which pushes
+    backpressure onto the clients through TCP flow control.
+    """
+
+    def __init__(self, num_points: int = 5, window: int = 256, queue_size: int = 1024,
+                 thresholds=RISK_THRESHOLDS, hampel_window: Optional[int] = None,
+                 max_request_bytes: int = MAX_REQUEST_BYTES):
+        check_thresholds(thresholds)
+        self.num_points = num_points
+        self.window = window
+        self.hampel_window = hampel_window
+        self.thresholds = thresholds
+        self.sensors: Dict[str, SensorStream] = {}
+        self.queue_size = queue_size
+        self.max_request_bytes = max_request_bytes
+        self.queue: Optional[asyncio.Queue] = None
+        self.stats = {'connections': 0, 'batches': 0, 'readings': 0, 'rejected': 0, 'flagged': 0}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None):
+        """Starts listening on a TCP port, or on a UNIX socket when unix_path is given."""
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self._consumer = asyncio.create_task(self._consume())
+        if unix_path:
+            self._server = await asyncio.start_unix_server(
+                self.handle_connection, path=unix_path, backlog=4096, limit=self.max_request_bytes
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self.handle_connection, host, port, backlog=4096, limit=self.max_request_bytes
+            )
+        return self._server
+
+    async def stop(self):
+        """Stops accepting connections and drains the pending readings."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.queue is not None:
+            await self.queue.join()
+        if self._consumer is not None:
+            self._consumer.cancel()
+
+    async def _consume(self):
+        while True:
+            batch = await self.queue.get()
+            try:
+                self.ingest(batch)
+            finally:
+                self.queue.task_done()
+
+    def ingest(self, batch: List[Any]):
+        """
+        Writes a batch of [sensor_id, x, y] readings into the per-sensor streams.
+        Invalid or out-of-order readings are counted as rejected and skipped, so one
+        bad reading never stops the rest of the batch (or the consumer task).
+        """
+        for entry in batch:
+            try:
+                sensor_id, x, y = parse_reading(entry)
+                stream = self.sensors.get(sensor_id)
+                if stream is None:
+                    outlier_filter = HampelFilter(self.hampel_window) if self.hampel_window else None
+                    stream = self.sensors[sensor_id] = SensorStream(self.num_points, self.window, outlier_filter)
+                if stream.add(x, y):
+                    self.stats['readings'] += 1
+                else:
+                    self.stats['flagged'] += 1
+            except (ValueError, TypeError):
+                self.stats['rejected'] += 1
+        self.stats['batches'] += 1
+
+    def predict(self, sensor_id: str, horizon: float) -> Dict[str, Any]:
+        """Returns the current prediction for a sensor, or an error record."""
+        stream = self.sensors.get(sensor_id)
+        if stream is None:
+            return {'error': f"Unknown sensor: {sensor_id}"}
+        try:
+            return dict(stream.predict(horizon, self.thresholds), sensor=sensor_id)
+        except ValueError as e:
+            return {'error': str(e)}
+
+    async def handle_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatches one decoded request; blocks while the ingest queue is full."""
+        if 'readings' in message:
+            if not isinstance(message['readings'], list):
+                raise ValueError("'readings' must be a list of [sensor_id, x, y].")
+            # Malformed readings are rejected here, before they reach the queue
+            batch, rejected = [], 0
+            for entry in message['readings']:
+                try:
+                    batch.append(parse_reading(entry))
+                except ValueError:
+                    rejected += 1
+            self.stats['rejected'] += rejected
+            if batch:
+                await self.queue.put(batch)
+            return {'ok': True, 'accepted': len(batch), 'rejected': rejected}
+        if 'predict' in message:
+            return self.predict(str(message['predict']), float(message.get('horizon', 1.0)))
+        return {'error': "Expected 'readings' or 'predict'."}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats['connections'] += 1
+        try:
+            first_line = await reader.readline()
+            if first_line.startswith(HTTP_METHODS):
+                await self._handle_http(first_line, reader, writer)
+                return
+            line = first_line
+            while line:
+                try:
+                    reply = await self.handle_message(json.loads(line))
+                except (ValueError, TypeError, KeyError) as e:
+                    reply = {'error': f"Invalid request: {e}"}
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+                line = await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            # A line over the stream limit cannot be reframed: report it and close
+            # (close() still flushes the reply)
+            writer.write(json.dumps({
+                'error': f"Request line exceeds {self.max_request_bytes} bytes; split the batch."
+            }).encode() + b'\n')
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_http(self, request_line: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        status, reply = '200 OK', None
+        try:
+            method, target = request_line.decode('latin-1').split()[:2]
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            url = urlsplit(target)
+            content_length = int(headers.get('content-length', 0))
+            if content_length < 0:
+                raise ValueError(f"Negative Content-Length: {content_length}")
+            if method == 'POST' and url.path == '/readings':
+                if content_length > self.max_request_bytes:
+                    # Refuse before reading: the body is never buffered
+                    status, reply = '413 Payload Too Large', {
+                        'error': f"Body exceeds {self.max_request_bytes} bytes; split the batch."
+                    }
+                else:
+                    body = await reader.readexactly(content_length)
+                    reply = await self.handle_message({'readings': json.loads(body)['readings']})
+            elif method == 'GET' and url.path == '/predict':
+                query = parse_qs(url.query)
+                reply = self.predict(query['sensor'][0], float(query.get('horizon', ['1.0'])[0]))
+            else:
+                status, reply = '404 Not Found', {'error': f"No route for {method} {url.path}"}
+        except (ValueError, TypeError, KeyError, asyncio.LimitOverrunError) as e:
+            status, reply = '400 Bad Request', {'error': f"Invalid request: {e}"}
+
+        payload = json.dumps(reply).encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
+
+
+async def run_load(host: str = '127.0.0.1', port: int = 8765, connections: int = 1000,
+                   batches: int = 10, batch_size: int = 50, sensors: int = 100) -> Dict[str, float]:
+    """
+    Local load generator: opens many concurrent connections that each stream batches
+    of readings over the line protocol and finish with one prediction query.
+
+    Returns:
+        Totals and throughput of the run.
+    """
+    async def client(client_id: int):
+        reader, writer = await asyncio.open_connection(host, port)
+        sensor_id = f"pond-{client_id % sensors}"
+        base = client_id * batches * batch_size
+        for b in range(batches):
+            readings = [
+                [f"{sensor_id}-{client_id}", float(base + b * batch_size + i), 6.0 + 0.001 * i]
+                for i in range(batch_size)
+            ]
+            writer.write(json.dumps({'readings': readings}).encode() + b'\n')
+            await writer.drain()
+            await reader.readline()
+        writer.write(json.dumps({'predict': f"{sensor_id}-{client_id}", 'horizon': 1.0}).encode() + b'\n')
+        await writer.drain()
+        await reader.readline()
+        writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(c) for c in range(connections)))
+    elapsed = time.perf_counter() - started
+    total = connections * batches * batch_size
+    return {'readings': total, 'seconds': elapsed, 'readings_per_second': total / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SmartTrend sensor ingestion service")
+    parser.add_argument('mode', choices=['serve', 'load'])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help="Serve on a UNIX socket path instead of TCP")
+    parser.add_argument('--points', type=int, default=5, help="Readings used per prediction")
+    parser.add_argument('--hampel', type=int, default=None, help="Hampel outlier filter window (off by default)")
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--batches', type=int, default=10)
+    parser.add_argument('--batch-size', type=int, default=50)
+    args = parser.parse_args()
+
+    if args.mode == 'load':
+        result = asyncio.run(run_load(args.host, args.port, args.connections, args.batches, args.batch_size))
+        print(f"Sent {result['readings']} readings in {result['seconds']:.2f}s "
+              f"({result['readings_per_second']:.0f} readings/s)")
+        return
+
+    async def serve():
+        service = IngestService(num_points=args.points, hampel_window=args.hampel)
+        server = await service.start(args.host, args.port, args.unix)
+        print(f"Listening on {args.unix or f'{args.host}:{args.port}'}")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+import os
+import random
+from typing import Callable, Dict, Optional
+
+# Set SMARTTREND_KERNELS=python to force the pure-Python reference implementations
+KERNELS_ENV = 'SMARTTREND_KERNELS'
+
+_compiled: Optional[Dict[str, Callable]] = None
+_min_points: Dict[str, int] = {}
+
+
+def _lagrange_weights_kernel(x_data, x_predict, weights):
+    # Same operations, in the same order, as lagrange.lagrange_weights_reference;
+    # fills weights[j] = L_j(x_predict)
+    n = len(x_data)
+    for j in range(n):
+        L_j_x = 1.0
+        for i in range(n):
+            if i != j:
+                denominator = x_data[j] - x_data[i]
+                if denominator == 0:
+                    raise ValueError("Error: Lagrange method detected identical x-values.")
+                L_j_x *= (x_predict - x_data[i]) / denominator
+        weights[j] = L_j_x
+
+
+def _divided_difference_kernel(x_data, table):
+    # Same operations as dividedDifference.divided_difference_table_reference;
+    # table[0] holds y on entry, row i receives the in-place coefficient vector
+    # after order i, so the last row holds the Newton coefficients
+    n = len(x_data)
+    for i in range(1, n):
+        for j in range(i):
+            table[i, j] = table[i-1, j]
+        for j in range(n - 1, i - 1, -1):
+            numerator = table[i-1, j] - table[i-1, j-1]
+            denominator = x_data[j] - x_data[j-i]
+            if denominator == 0:
+                raise ValueError("Error: Divided difference method detected identical x-values.")
+            table[i, j] = numerator / denominator
+
+
+def _horner_kernel(x_data, coef, x_predict, steps):
+    # Same operations as dividedDifference.newton_horner_steps_reference;
+    # fills the successive Horner values, the last one being P(x_predict)
+    n = len(coef)
+    steps[0] = coef[n-1]
+    for step in range(1, n):
+        i = n - 1 - step
+        steps[step] = steps[step-1] * (x_predict - x_data[i]) + coef[i]
+
+
+def _compile() -> Dict[str, Callable]:
+    if os.environ.get(KERNELS_ENV, '').lower() == 'python':
+        return {}
+    try:
+        from numba import njit
+    except ImportError:
+        return {}
+    # No fastmath: compiled kernels must stay bit-for-bit identical to the reference
+    return {
+        'lagrange_weights': njit(cache=True)(_lagrange_weights_kernel),
+        'divided_difference_table': njit(cache=True)(_divided_difference_kernel),
+        'horner_steps': njit(cache=True)(_horner_kernel),
+    }
+
+
+def get_kernel(name: str, points: Optional[int] = None) -> Optional[Callable]:
+    """
+    Returns the compiled kernel `name` ('lagrange_weights', 'divided_difference_table' or
+    'horner_steps'), or None when no accelerated backend is available. Numba is
+    imported on first use.
+
+    Callers that convert lists to arrays around the call pass the subset size as
+    `points`; below dispatcher.KERNEL_MIN_POINTS[name] that conversion costs more
+    than the interpreted loop, so None is returned and the reference runs instead.
+    """
+    global _compiled, _min_points
+    if _compiled is None:
+        _compiled = _compile()
+        if _compiled:
+            # Imported here: the dispatcher itself imports the engines that use the kernels
+            from dispatcher import KERNEL_MIN_POINTS
+            _min_points = dict(KERNEL_MIN_POINTS)
+    if points is not None and points < _min_points.get(name, 0):
+        return None
+    return _compiled.get(name)
+
+
+def backend() -> str:
+    """Name of the active kernel backend: 'numba' or 'python'."""
+    return 'numba' if get_kernel('lagrange_weights') is not None else 'python'
+
+
+def verify_kernels(trials: int = 2000, max_points: int = 24, seed: int = 0) -> int:
+    """
+    Checks the active backend bit-for-bit against the pure-Python reference on random
+    subsets, including large-offset x-values such as Unix timestamps. `max_points`
+    reaches past every KERNEL_MIN_POINTS threshold so the kernels themselves are compared.
+
+    Returns:
+        The number of trials compared; raises AssertionError on the first mismatch.
+    """
+    from lagrange import lagrange_interpolation, lagrange_reference, lagrange_weights, lagrange_weights_reference
+    from dividedDifference import (
+        divided_difference_coefficients,
+        divided_difference_coefficients_reference,
+        divided_difference_interpolation,
+        divided_difference_table,
+        divided_difference_table_reference,
+        newton_horner_reference,
+        newton_horner_steps,
+        newton_horner_steps_reference,
+    )
+
+    rng = random.Random(seed)
+    for trial in range(trials):
+        n = rng.randint(2, max_points)
+        offset = rng.choice([0.0, 1.7e9])
+        x_data = [offset + v for v in rng.sample(range(1, 1000), n)]
+        y_data = [rng.uniform(0.0, 20.0) for _ in range(n)]
+        x_predict = max(x_data) + rng.uniform(-50.0, 50.0)
+
+        reference_coef = divided_difference_coefficients_reference(x_data, y_data)
+        pairs = [
+            (lagrange_interpolation(x_data, y_data, x_predict), lagrange_reference(x_data, y_data, x_predict)),
+            (divided_difference_interpolation(x_data, y_data, x_predict),
+             newton_horner_reference(x_data, reference_coef, x_predict)),
+        ]
+        pairs += zip(divided_difference_coefficients(x_data, y_data), reference_coef)
+        # Intermediates shown in the step-by-step solutions
+        pairs += zip(lagrange_weights(x_data, x_predict), lagrange_weights_reference(x_data, x_predict))
+        pairs += zip(newton_horner_steps(x_data, reference_coef, x_predict),
+                     newton_horner_steps_reference(x_data, reference_coef, x_predict))
+        for column, reference_column in zip(divided_difference_table(x_data, y_data),
+                                            divided_difference_table_reference(x_data, y_data)):
+            assert len(column) == len(reference_column), f"Table shape mismatch in trial {trial}"
+            pairs += zip(column, reference_column)
+        for accelerated, reference in pairs:
+            assert accelerated == reference or (accelerated != accelerated and reference != reference), (
+                f"Kernel mismatch in trial {trial}: {accelerated!r} != {reference!r}"
+            )
+    return trials
+
+
+if __name__ == '__main__':
+    print(f"Kernel backend: {backend()}")
+    print(f"Verified {verify_kernels()} random subsets bit-for-bit against the reference.")
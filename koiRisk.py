@@ -0,0 +1,92 @@
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Dict, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Lower bounds (mg/L) of the DANGER, CAUTION and SAFE bands; anything below the
+# first threshold is CRITICAL. A value equal to a threshold belongs to the band above it.
+RISK_THRESHOLDS = (3.0, 4.0, 6.0)
+
+# Risk codes index into RISK_LEVELS (0 = CRITICAL ... 3 = SAFE)
+CRITICAL, DANGER, CAUTION, SAFE = range(4)
+
+RISK_LEVELS = (
+    {
+        'status': 'CRITICAL',
+        'message': 'Oxygen critically low',
+        'action': 'Activate aerators immediately and consider emergency oxygenation',
+        'color': '#FF0000'
+    },
+    {
+        'status': 'DANGER',
+        'message': 'Oxygen dangerously low',
+        'action': 'Add aeration immediately and reduce stocking stressors',
+        'color': '#FFA500'
+    },
+    {
+        'status': 'CAUTION',
+        'message': 'Oxygen slightly low',
+        'action': 'Increase aeration and monitor closely',
+        'color': '#FFFF00'
+    },
+    {
+        'status': 'SAFE',
+        'message': 'Optimal oxygen level',
+        'action': 'Maintain current aeration',
+        'color': '#00FF00'
+    },
+)
+
+# Risk code of each status, for records carrying a risk level
+STATUS_CODES = {level['status']: code for code, level in enumerate(RISK_LEVELS)}
+
+# Plot styling of the line drawn at each threshold, aligned with RISK_THRESHOLDS
+THRESHOLD_LINES = (
+    {'label': 'Critical', 'color': '#FF0000', 'linestyle': '-'},
+    {'label': 'Caution', 'color': '#FFA500', 'linestyle': '--'},
+    {'label': 'Optimal', 'color': '#00FF00', 'linestyle': '--'},
+)
+
+
+def check_thresholds(thresholds: Sequence[float]):
+    """Raises ValueError unless there is exactly one threshold per level above CRITICAL."""
+    if len(thresholds) != len(RISK_LEVELS) - 1:
+        raise ValueError(
+            f"Expected {len(RISK_LEVELS) - 1} risk thresholds (one per level above CRITICAL), got {len(thresholds)}."
+        )
+
+
+def classify_koi_risk(do_values, thresholds: Sequence[float] = RISK_THRESHOLDS) -> 'np.ndarray':
+    """
+    Classifies an array of dissolved oxygen values into integer risk codes.
+
+    Args:
+        do_values: Scalar or array of DO values (mg/L).
+        thresholds: Ascending band boundaries, one per level above CRITICAL.
+
+    Returns:
+        An int8 array of codes indexing RISK_LEVELS; NaN is treated as CRITICAL.
+    """
+    import numpy as np
+
+    check_thresholds(thresholds)
+    values = np.asarray(do_values, dtype=float)
+    codes = np.searchsorted(np.asarray(thresholds, dtype=float), values, side='right')
+    return np.where(np.isnan(values), CRITICAL, codes).astype(np.int8)
+
+
+def koi_risk_code(do_value: float, thresholds: Sequence[float] = RISK_THRESHOLDS) -> int:
+    """Scalar counterpart of classify_koi_risk, avoiding NumPy call overhead."""
+    check_thresholds(thresholds)
+    if do_value != do_value:  # NaN
+        return CRITICAL
+    return bisect_right(thresholds, do_value)
+
+
+def risk_level(code: int) -> Dict[str, str]:
+    """
+    Returns the status/message/action/color record for a risk code, as a copy:
+    predictions own their record, so changing one never touches RISK_LEVELS.
+    """
+    return dict(RISK_LEVELS[int(code)])
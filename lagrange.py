@@ -1,10 +1,16 @@
-from typing import List
+from typing import TYPE_CHECKING, List
+
+from kernels import get_kernel
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def lagrange_interpolation(x_data: List[float], y_data: List[float], x_predict: float) -> float:
     """
     Performs Lagrange extrapolation (via interpolation polynomial).
     Requires a minimum of 2 data points (n >= 2).
+    Uses the compiled kernel when an accelerated backend is available.
     
     Args:
         x_data: List of x-coordinates (time).
@@ -17,8 +23,53 @@ def lagrange_interpolation(x_data: List[float], y_data: List[float], x_predict:
     n = len(x_data)
     if n < 2 or n != len(y_data):
         raise ValueError(f"Lagrange method requires a minimum of 2 points. Got {n}.")
+    return lagrange_combine(y_data, lagrange_weights(x_data, x_predict))
+
+
+def lagrange_reference(x_data: List[float], y_data: List[float], x_predict: float) -> float:
+    """Pure-Python reference for lagrange_interpolation (also the fallback)."""
+    return lagrange_combine(y_data, lagrange_weights_reference(x_data, x_predict))
 
+
+def lagrange_combine(y_data: List[float], weights: List[float]) -> float:
+    """P(x) = Sum [ y_j * L_j(x) ], accumulated in order of j."""
     P_x = 0.0
+    for y_j, L_j_x in zip(y_data, weights):
+        P_x += y_j * L_j_x
+    return P_x
+
+
+def lagrange_weights(x_data: List[float], x_predict: float) -> List[float]:
+    """
+    Evaluates the Lagrange basis L_0..L_{n-1} at one target. These are the
+    intermediate numbers of lagrange_interpolation, so a step-by-step solution can
+    be rendered from them. Uses the compiled kernel when an accelerated backend is available
+    and the subset is large enough to pay for the array conversion.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        x_predict: The x-value at which to evaluate the basis.
+
+    Returns:
+        The list of basis values L_j(x_predict).
+    """
+    n = len(x_data)
+    if n < 2:
+        raise ValueError(f"Lagrange method requires a minimum of 2 points. Got {n}.")
+
+    kernel = get_kernel('lagrange_weights', n)
+    if kernel is not None:
+        import numpy as np
+        weights = np.empty(n)
+        kernel(np.array(x_data, dtype=np.float64), float(x_predict), weights)
+        return weights.tolist()
+    return lagrange_weights_reference(x_data, x_predict)
+
+
+def lagrange_weights_reference(x_data: List[float], x_predict: float) -> List[float]:
+    """Pure-Python reference for lagrange_weights (also the fallback)."""
+    n = len(x_data)
+    weights = []
     
     # For each data point j, compute the Lagrange basis polynomial L_j(x)
     for j in range(n):
@@ -34,7 +85,79 @@ def lagrange_interpolation(x_data: List[float], y_data: List[float], x_predict:
                 # L_j(x) = Product [ (x - x_i) / (x_j - x_i) ] for all i != j
                 L_j_x *= (x_predict - x_data[i]) / denominator
         
-        # P(x) = Sum [ y_j * L_j(x) ]
-        P_x += y_data[j] * L_j_x
+        weights.append(L_j_x)
         
-    return P_x
\ No newline at end of file
+    return weights
+
+
+def lagrange_basis(x_data: List[float], x_targets) -> 'np.ndarray':
+    """
+    Evaluates every Lagrange basis polynomial L_j at every target in one pass.
+    
+    Args:
+        x_data: List of x-coordinates (time) defining the basis.
+        x_targets: Sequence of x-values at which to evaluate the basis.
+        
+    Returns:
+        A (len(x_targets), n) array whose row m holds L_0..L_{n-1} at x_targets[m].
+    """
+    import numpy as np
+
+    x = np.asarray(x_data, dtype=float)
+    t = np.asarray(x_targets, dtype=float).reshape(-1)
+    n = len(x)
+    if n < 2:
+        raise ValueError(f"Lagrange method requires a minimum of 2 points. Got {n}.")
+
+    # denominators[j, i] = x_j - x_i, with the diagonal neutralised for the product
+    denominators = x[:, None] - x[None, :]
+    np.fill_diagonal(denominators, 1.0)
+    if np.any(denominators == 0):
+        raise ValueError("Error: Lagrange method detected identical x-values.")
+
+    # ratios[m, j, i] = (t_m - x_i) / (x_j - x_i) for all i != j
+    ratios = (t[:, None, None] - x[None, None, :]) / denominators[None, :, :]
+    diagonal = np.arange(n)
+    ratios[:, diagonal, diagonal] = 1.0
+    return np.prod(ratios, axis=2)
+
+
+def lagrange_interpolation_many(x_data: List[float], y_data: List[float], x_targets) -> 'np.ndarray':
+    """
+    Vectorized Lagrange extrapolation of several targets sharing one data subset.
+    
+    Args:
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+        x_targets: Sequence of x-values for which to predict y.
+        
+    Returns:
+        An array of predicted y-values, one per target.
+    """
+    import numpy as np
+
+    if len(x_data) != len(y_data):
+        raise ValueError(f"Lagrange method requires a minimum of 2 points. Got {len(x_data)}.")
+    return lagrange_basis(x_data, x_targets) @ np.asarray(y_data, dtype=float)
+
+
+def lagrange_interpolation_columns(x_data: List[float], y_columns, x_targets) -> 'np.ndarray':
+    """
+    Lagrange extrapolation of several y-series sharing one data subset.
+    The basis weights depend only on x, so they are computed once and applied
+    to every series in one matrix product.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_columns: An (n, K) array with one series per column.
+        x_targets: Sequence of x-values for which to predict.
+
+    Returns:
+        A (len(x_targets), K) array of predicted values.
+    """
+    import numpy as np
+
+    y = np.asarray(y_columns, dtype=float)
+    if len(x_data) != len(y):
+        raise ValueError(f"Lagrange method requires a minimum of 2 points. Got {len(x_data)}.")
+    return lagrange_basis(x_data, x_targets) @ y.reshape(len(y), -1)
@@ -0,0 +1,168 @@
+import json
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+# Upper bounds (seconds) of the latency histogram buckets; a final +Inf bucket is implied
+LATENCY_BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0)
+
+
+class _NullStage:
+    """Shared no-op context used while metrics are disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """Times one execution of a pipeline stage."""
+
+    def __init__(self, registry: 'MetricsRegistry', name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started)
+        if exc_type is not None:
+            self.registry.increment(f"{self.name}_errors")
+        return False
+
+
+class MetricsRegistry:
+    """
+    Per-stage counters and latency histograms, with an optional cProfile/tracemalloc session.
+    While disabled, stage() returns a shared no-op context and increment() returns
+    immediately, so instrumented code pays only an attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.counters: Dict[str, int] = {}
+        # name -> bucket counts (len(LATENCY_BUCKETS) + 1), plus running sum and count
+        self.histograms: Dict[str, Dict[str, Any]] = {}
+        self._profiler = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+
+    def stage(self, name: str):
+        """Context manager timing one run of a stage: `with metrics.stage('select'): ...`."""
+        if not self.enabled:
+            return NULL_STAGE
+        return _Stage(self, name)
+
+    def increment(self, name: str, amount: int = 1):
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float):
+        """Records one latency sample for a stage and bumps its call counter."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = {'buckets': [0] * (len(LATENCY_BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+        histogram['buckets'][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram['sum'] += seconds
+        histogram['count'] += 1
+
+    # --- Profiling ---
+
+    @property
+    def profiling(self) -> bool:
+        """Whether a cProfile/tracemalloc session is running."""
+        return self._profiler is not None
+
+    def start_profiling(self):
+        """Starts cProfile and tracemalloc for the whole process."""
+        import cProfile
+        import tracemalloc
+
+        self._profiler = cProfile.Profile()
+        tracemalloc.start()
+        self._profiler.enable()
+
+    def stop_profiling(self, limit: int = 20) -> str:
+        """
+        Stops the profiling session.
+
+        Returns:
+            A text report with the top functions by cumulative time and the top
+            allocation sites.
+        """
+        import io
+        import pstats
+        import tracemalloc
+
+        if self._profiler is None:
+            return "Profiling was not started."
+        self._profiler.disable()
+        report = io.StringIO()
+        pstats.Stats(self._profiler, stream=report).sort_stats('cumulative').print_stats(limit)
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self._profiler = None
+
+        report.write(f"\nMemory: current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n")
+        for stat in snapshot.statistics('lineno')[:limit]:
+            report.write(f"  {stat}\n")
+        return report.getvalue()
+
+    # --- Export ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        stages = {}
+        for name, histogram in self.histograms.items():
+            stages[name] = {
+                'count': histogram['count'],
+                'sum_seconds': histogram['sum'],
+                'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], histogram['buckets']))
+            }
+        return {'counters': dict(self.counters), 'stages': stages}
+
+    def to_prometheus(self, prefix: str = 'smarttrend') -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"{prefix}_{name} {value}")
+        if self.histograms:
+            lines.append(f"# TYPE {prefix}_stage_seconds histogram")
+        for name, histogram in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(list(LATENCY_BUCKETS) + ['+Inf'], histogram['buckets']):
+                cumulative += count
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {histogram["sum"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {histogram["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str, fmt: Optional[str] = None):
+        """Writes the metrics to path as JSON ('.json') or Prometheus text (anything else)."""
+        fmt = fmt or ('json' if path.endswith('.json') else 'prometheus')
+        with open(path, 'w', encoding='utf-8') as f:
+            if fmt == 'json':
+                json.dump(self.to_dict(), f, indent=2)
+            else:
+                f.write(self.to_prometheus())
+
+
+# Process-wide registry shared by the CLI, the GUI and the core
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,111 @@
+from bisect import bisect_left, insort
+from collections import deque
+from typing import TYPE_CHECKING, Deque, List
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Scales the median absolute deviation to a standard deviation for Gaussian noise
+MAD_SCALE = 1.4826
+
+# Fewest preceding samples needed before anything is flagged
+MIN_PERIODS = 3
+
+
+def _kth_deviation(ordered: List[float], split: int, median: float, k: int) -> float:
+    # Absolute deviations from the median form two ascending runs over the sorted
+    # window: median - ordered[split-1-i] below it and ordered[split+j] - median
+    # above it. The k-th smallest (0-based) of their union is found by binary
+    # search on how many of the k + 1 smallest come from the lower run.
+    n_lower, n_upper = split, len(ordered) - split
+    lo, hi = max(0, k + 1 - n_upper), min(k + 1, n_lower)
+    while lo < hi:
+        i = (lo + hi) // 2
+        if median - ordered[split - 1 - i] < ordered[split + k - i] - median:
+            lo = i + 1
+        else:
+            hi = i
+    lower = median - ordered[split - lo] if lo > 0 else 0.0
+    upper = ordered[split + k - lo] - median if lo <= k else 0.0
+    return max(lower, upper)
+
+
+class HampelFilter:
+    """
+    Streaming Hampel filter.
+    Each new value is compared with the median of the preceding `window` values and
+    flagged when it deviates by more than n_sigmas scaled median absolute deviations.
+    The window is kept sorted, so the median is an index lookup and the MAD a
+    binary search (see _kth_deviation); each update costs O(log window)
+    comparisons plus one list insert and delete, without sorting or allocating.
+    """
+
+    def __init__(self, window: int = 7, n_sigmas: float = 3.0):
+        if window < MIN_PERIODS:
+            raise ValueError(f"Hampel window must be at least {MIN_PERIODS}. Got {window}.")
+        self.window = window
+        self.n_sigmas = n_sigmas
+        self.recent: Deque[float] = deque()
+        self.sorted_recent: List[float] = []
+
+    def update(self, value: float) -> bool:
+        """
+        Feeds one value and reports whether it is an outlier.
+
+        Args:
+            value: The next sample of the stream.
+
+        Returns:
+            True if the value is flagged as an anomaly.
+        """
+        flagged = False
+        count = len(self.sorted_recent)
+        if count >= MIN_PERIODS:
+            ordered = self.sorted_recent
+            median = 0.5 * (ordered[(count - 1) // 2] + ordered[count // 2])
+            split = bisect_left(ordered, median)
+            mad = 0.5 * (_kth_deviation(ordered, split, median, (count - 1) // 2)
+                         + _kth_deviation(ordered, split, median, count // 2))
+            flagged = abs(value - median) > self.n_sigmas * MAD_SCALE * mad
+
+        # Slide the window; outliers are kept in it, the median is robust to them
+        self.recent.append(value)
+        insort(self.sorted_recent, value)
+        if len(self.recent) > self.window:
+            oldest = self.recent.popleft()
+            del self.sorted_recent[bisect_left(self.sorted_recent, oldest)]
+        return flagged
+
+
+def hampel_flags(values, window: int = 7, n_sigmas: float = 3.0) -> 'np.ndarray':
+    """
+    Vectorized equivalent of running HampelFilter over a whole series.
+
+    Args:
+        values: Sequence of samples, in time order.
+        window: Number of preceding samples each value is compared against.
+        n_sigmas: Threshold in scaled median absolute deviations.
+
+    Returns:
+        A boolean array, True where a sample is flagged as an anomaly.
+    """
+    import numpy as np
+
+    if window < MIN_PERIODS:
+        raise ValueError(f"Hampel window must be at least {MIN_PERIODS}. Got {window}.")
+    y = np.asarray(values, dtype=float)
+    flags = np.zeros(len(y), dtype=bool)
+
+    # Warm-up: fewer than `window` preceding samples are available
+    for i in range(MIN_PERIODS, min(window, len(y))):
+        history = y[:i]
+        median = np.median(history)
+        mad = np.median(np.abs(history - median))
+        flags[i] = abs(y[i] - median) > n_sigmas * MAD_SCALE * mad
+
+    if len(y) > window:
+        history = np.lib.stride_tricks.sliding_window_view(y[:-1], window)
+        median = np.median(history, axis=1)
+        mad = np.median(np.abs(history - median[:, None]), axis=1)
+        flags[window:] = np.abs(y[window:] - median) > n_sigmas * MAD_SCALE * mad
+    return flags
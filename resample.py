@@ -0,0 +1,62 @@
+from typing import TYPE_CHECKING, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Supported ways of reducing the samples that fall into one bin
+AGGREGATIONS = ('mean', 'median', 'last')
+
+
+def resample_series(x_values, y_values, cadence: Optional[float] = None, how: str = 'mean',
+                    origin: Optional[float] = None) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Deduplicates and bins an irregular series onto a regular cadence.
+    Every bin [origin + k*cadence, origin + (k+1)*cadence) with at least one
+    sample yields one output point; empty bins (gaps) yield none.
+
+    Args:
+        x_values: Sequence of x-coordinates (time), in any order.
+        y_values: Sequence of y-coordinates (value).
+        cadence: Bin width in x units. None only merges samples with identical x.
+        how: Aggregation of the y-values in a bin: 'mean', 'median' or 'last'.
+        origin: Left edge of the first bin; defaults to the smallest x.
+
+    Returns:
+        A tuple (x, y) of arrays sorted by x. For 'mean' and 'median' the x of a
+        bin is the mean time of its samples; for 'last' it is the latest time.
+    """
+    import numpy as np
+
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation: {how}. Expected one of {', '.join(AGGREGATIONS)}.")
+    if cadence is not None and cadence <= 0:
+        raise ValueError(f"Resampling cadence must be positive. Got {cadence}.")
+
+    x = np.asarray(x_values, dtype=float)
+    y = np.asarray(y_values, dtype=float)
+    if len(x) == 0:
+        return x, y
+
+    order = np.argsort(x, kind='stable')
+    x, y = x[order], y[order]
+    if cadence is None:
+        keys = x
+    else:
+        keys = np.floor((x - (x[0] if origin is None else origin)) / cadence)
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(x)]
+    counts = ends - starts
+
+    if how == 'last':
+        return x[ends - 1], y[ends - 1]
+
+    x_out = np.add.reduceat(x, starts) / counts
+    if how == 'mean':
+        return x_out, np.add.reduceat(y, starts) / counts
+
+    # Median: sort the values inside each bin, then average the middle pair
+    y_sorted = y[np.lexsort((y, keys))]
+    lower = starts + (counts - 1) // 2
+    upper = starts + counts // 2
+    return x_out, 0.5 * (y_sorted[lower] + y_sorted[upper])
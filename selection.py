@@ -0,0 +1,102 @@
+from typing import TYPE_CHECKING, Any, Callable, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def nearest_subset_indices(x_values, targets, num_points: int) -> 'np.ndarray':
+    """
+    Selects, for every target, the indices of the num_points data points closest to it.
+    Ties are broken by original position, matching a stable sort on distance.
+
+    Args:
+        x_values: Sequence of x-coordinates of the full data set.
+        targets: Sequence of x-values to select subsets for.
+        num_points: Number of closest points per target.
+
+    Returns:
+        A (len(targets), num_points) index array, each row ordered by distance.
+    """
+    import numpy as np
+
+    x = np.asarray(x_values, dtype=float)
+    t = np.asarray(targets, dtype=float).reshape(-1)
+    n = len(x)
+    if num_points < 1 or num_points > n:
+        raise ValueError(f"Cannot select {num_points} points from {n} available.")
+
+    # The k nearest points of a target form a contiguous run of the x-sorted data,
+    # so only a window of 2k candidates around its insertion position is examined.
+    order = np.argsort(x, kind='stable')
+    width = min(2 * num_points, n)
+    position = np.searchsorted(x[order], t)
+    start = np.clip(position - num_points, 0, n - width)
+    candidates = order[start[:, None] + np.arange(width)]
+
+    distances = np.abs(x[candidates] - t[:, None])
+    ranking = np.lexsort((candidates, distances), axis=-1)[:, :num_points]
+    return np.take_along_axis(candidates, ranking, axis=1)
+
+
+def group_by_subset(indices: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Collapses per-target subsets that contain the same points.
+
+    Args:
+        indices: Index array as returned by nearest_subset_indices.
+
+    Returns:
+        A tuple (subsets, owner) where subsets holds each distinct subset as a row of
+        ascending indices and owner[m] is the row of subsets used by target m.
+    """
+    import numpy as np
+
+    subsets, owner = np.unique(np.sort(indices, axis=1), axis=0, return_inverse=True)
+    return subsets, owner.reshape(-1)
+
+
+def predict_by_subset(x_all, y_all, targets, num_points: int,
+                      evaluate: Callable) -> Tuple['np.ndarray', 'np.ndarray', List[Any], int]:
+    """
+    Selects a subset per target, groups the targets whose subsets coincide and
+    evaluates each distinct subset once for all its targets. One extra nearest
+    point per target is held back as its reserve point for the uncertainty band.
+    Shared by trendCore.predict_targets (one y-series) and
+    seriesStore.predict_columns (one y column per parameter).
+
+    Args:
+        x_all: float64 array of x-values.
+        y_all: float64 array of y-values, (len(x_all),) or (len(x_all), K).
+        targets: Array of x-values to predict.
+        num_points: Subset size per target (2 <= num_points <= len(x_all)).
+        evaluate: Callable (x, y, targets, x_reserve, y_reserve) -> (predicted
+                  values, uncertainty half-widths, info) for one subset and its
+                  targets; the reserve arguments hold each target's reserve point,
+                  or are None when the subset already uses every point.
+
+    Returns:
+        A tuple (predicted values, uncertainty half-widths, info per target,
+        number of distinct subsets); the arrays have shape (len(targets),) + y_all.shape[1:].
+    """
+    import numpy as np
+
+    reserve = num_points < len(x_all)
+    nearest = nearest_subset_indices(x_all, targets, num_points + reserve)
+    subsets, owner = group_by_subset(nearest[:, :num_points])
+
+    y_predicted = np.empty((len(targets),) + y_all.shape[1:])
+    uncertainty = np.empty_like(y_predicted)
+    info: List[Any] = [None] * len(targets)
+    for g, subset in enumerate(subsets):
+        rows = np.flatnonzero(owner == g)
+        if reserve:
+            # Targets sharing a subset may still hold back different reserve points
+            extra = nearest[rows, num_points]
+            values, band, group_info = evaluate(x_all[subset], y_all[subset], targets[rows], x_all[extra], y_all[extra])
+        else:
+            values, band, group_info = evaluate(x_all[subset], y_all[subset], targets[rows], None, None)
+        y_predicted[rows] = values
+        uncertainty[rows] = band
+        for row in rows.tolist():
+            info[row] = group_info
+    return y_predicted, uncertainty, info, len(subsets)
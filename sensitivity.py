@@ -0,0 +1,97 @@
+import csv
+from typing import TYPE_CHECKING, Any, Dict, TextIO, Tuple
+
+from dividedDifference import divided_difference_coefficients, newton_terms
+from koiRisk import RISK_LEVELS
+from selection import nearest_subset_indices
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Largest subset size swept by default; higher-degree interpolants only add ringing
+SENSITIVITY_MAX_SIZE = 16
+
+# Columns of the CSV export, one row per (subset size, horizon) cell
+CSV_COLUMNS = ('subset_size', 'horizon', 'x', 'y', 'uncertainty', 'risk')
+
+
+def sensitivity_grid(x_all, y_all, targets, sizes) -> Tuple['np.ndarray', 'np.ndarray', int]:
+    """
+    Predicts every target with every subset size in one pass.
+
+    For a target, the subset of size k is its k nearest points, so the subsets of
+    all sizes are prefixes of one nearest-first node ordering. In Newton form over
+    that ordering, the interpolant through the first k nodes is the sum of the
+    first k terms, and term k is its uncertainty band (the next nearest point held
+    back, as in trendCore.predict_targets). One divided difference table per
+    distinct ordering therefore serves the whole column of sizes, and targets
+    sharing an ordering are evaluated together.
+
+    Args:
+        x_all: float64 array of (preprocessed) x-values.
+        y_all: float64 array of y-values.
+        targets: Array of x-values to predict.
+        sizes: Subset sizes, each between 2 and len(x_all).
+
+    Returns:
+        A tuple (predicted values, uncertainty half-widths, number of distinct
+        orderings); both arrays have shape (len(sizes), len(targets)).
+    """
+    import numpy as np
+
+    x_all = np.asarray(x_all, dtype=float)
+    y_all = np.asarray(y_all, dtype=float)
+    targets = np.asarray(targets, dtype=float).reshape(-1)
+    sizes = np.asarray(sizes, dtype=np.int64).reshape(-1)
+    n = len(x_all)
+    if len(sizes) == 0 or sizes.min() < 2 or sizes.max() > n:
+        raise ValueError(f"Subset sizes must lie between 2 and {n}.")
+
+    # One node beyond the largest subset is held back for its band, when available
+    depth = min(int(sizes.max()) + 1, n)
+    orderings, owner = np.unique(nearest_subset_indices(x_all, targets, depth), axis=0, return_inverse=True)
+    owner = owner.reshape(-1)
+    # Band term per size: the held-back node's term, or, for a subset using
+    # every point, the interpolant's own last term
+    band_rows = np.minimum(sizes, depth - 1)
+
+    y_predicted = np.empty((len(sizes), len(targets)))
+    uncertainty = np.empty((len(sizes), len(targets)))
+    for g, nodes in enumerate(orderings):
+        cols = np.flatnonzero(owner == g)
+        x = x_all[nodes]
+        centre = 0.5 * (x.max() + x.min())
+        scale = 0.5 * (x.max() - x.min()) or 1.0
+        scaled_x = ((x - centre) / scale).tolist()
+        coef = divided_difference_coefficients(scaled_x, y_all[nodes].tolist())
+        terms = newton_terms(scaled_x, coef, (targets[cols] - centre) / scale)
+        y_predicted[:, cols] = np.cumsum(terms, axis=0)[sizes - 1]
+        uncertainty[:, cols] = np.abs(terms[band_rows])
+    return y_predicted, uncertainty, len(orderings)
+
+
+def write_sensitivity_csv(grid: Dict[str, Any], stream: TextIO) -> int:
+    """
+    Writes a grid from SmartTrendCore.sensitivity_grid as CSV, one row per
+    (subset size, horizon) cell with the columns of CSV_COLUMNS.
+
+    Args:
+        grid: The sensitivity grid record.
+        stream: An open text stream (open it with newline='').
+
+    Returns:
+        The number of cells written.
+    """
+    writer = csv.writer(stream)
+    writer.writerow(CSV_COLUMNS)
+    count = 0
+    for i, size in enumerate(grid['sizes'].tolist()):
+        for j, (horizon, x) in enumerate(zip(grid['horizons'].tolist(), grid['x'].tolist())):
+            writer.writerow([
+                size, horizon, x,
+                float(grid['y'][i, j]),
+                float(grid['uncertainty'][i, j]),
+                RISK_LEVELS[int(grid['risk'][i, j])]['status']
+            ])
+            count += 1
+    return count
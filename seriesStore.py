@@ -0,0 +1,186 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from lagrange import lagrange_interpolation_columns
+from dividedDifference import divided_difference_interpolation_columns, newton_remainder_columns
+from chebyshev import chebyshev_interpolation_columns
+from selection import predict_by_subset
+from dispatcher import auto_interpolation_columns, DISPATCHER
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Engines predicting every y column of a shared subset in one pass: (x, Y, targets) -> (targets, K)
+COLUMN_ENGINES = {
+    'Lagrange': lagrange_interpolation_columns,
+    'Divided Difference': divided_difference_interpolation_columns,
+    'Chebyshev': chebyshev_interpolation_columns,
+    'Auto': auto_interpolation_columns
+}
+
+
+def predict_columns(x_all, y_all, targets, num_points: int, method: str, routes: Optional[List[str]] = None):
+    """
+    Multi-series counterpart of trendCore.predict_targets (both run on
+    selection.predict_by_subset): subsets are selected once per target from the
+    shared x index, and each distinct subset is fitted for all y columns together.
+
+    Args:
+        x_all: float64 array of x-values.
+        y_all: (len(x_all), K) float64 array, one parameter per column.
+        targets: Array of x-values to predict.
+        num_points: Subset size per target (2 <= num_points <= len(x_all)).
+        method: A key of COLUMN_ENGINES.
+        routes: Optional list, filled with the engine that served each target
+                (the dispatcher's choice for 'Auto', otherwise the method itself).
+
+    Returns:
+        A tuple (predicted values, uncertainty half-widths, number of distinct subsets);
+        both arrays have shape (len(targets), K).
+    """
+    engine = COLUMN_ENGINES[method]
+
+    def evaluate(x, y, t, x_reserve, y_reserve):
+        # One Newton fit per subset gives every target's band against its own reserve point
+        estimate, band = newton_remainder_columns(x, y, t, x_reserve, y_reserve)
+        if method == 'Divided Difference':
+            # The Newton fit is the engine: its estimate is the prediction
+            return estimate, band, method
+        if method == 'Auto':
+            values, route = DISPATCHER.interpolate_columns(x, y, t)
+            return values, band, route
+        return engine(x, y, t), band, method
+
+    y_predicted, uncertainty, info, num_subsets = predict_by_subset(x_all, y_all, targets, num_points, evaluate)
+    if routes is not None:
+        routes[:] = info
+    return y_predicted, uncertainty, num_subsets
+
+
+class SeriesStore:
+    """
+    Several parameters (e.g. DO, temperature, pH) sampled at the same timestamps:
+    one shared float64 x index and one float64 y column per parameter, kept in
+    preallocated arrays that grow geometrically, so appends are amortized O(K).
+    """
+
+    def __init__(self, names: Sequence[str], capacity: int = 1024):
+        import numpy as np
+
+        if not names:
+            raise ValueError("A series store needs at least one parameter column.")
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate parameter names: {', '.join(names)}.")
+        self.names = list(names)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._x = np.empty(max(capacity, 1))
+        self._y = np.empty((max(capacity, 1), len(self.names)))
+        self._size = 0
+
+    @classmethod
+    def from_columns(cls, x_values, columns: Dict[str, Sequence[float]]) -> 'SeriesStore':
+        """
+        Builds a store from a shared x sequence and equal-length parameter columns.
+
+        Args:
+            x_values: Sequence of x-coordinates (time).
+            columns: Mapping of parameter name -> sequence of values, e.g. {'DO': ..., 'pH': ...}.
+        """
+        import numpy as np
+
+        store = cls(list(columns), capacity=len(x_values))
+        store.extend(x_values, np.column_stack([np.asarray(v, dtype=float) for v in columns.values()]))
+        return store
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def x(self) -> 'np.ndarray':
+        """View of the shared x index."""
+        return self._x[:self._size]
+
+    @property
+    def values(self) -> 'np.ndarray':
+        """View of all parameters as a (len(store), K) array."""
+        return self._y[:self._size]
+
+    def column(self, name: str) -> 'np.ndarray':
+        """View of one parameter column."""
+        if name not in self._index:
+            raise ValueError(f"Unknown parameter: {name}. Expected one of {', '.join(self.names)}.")
+        return self._y[:self._size, self._index[name]]
+
+    def _reserve(self, size: int):
+        import numpy as np
+
+        if size <= len(self._x):
+            return
+        capacity = max(size, 2 * len(self._x))
+        x, y = np.empty(capacity), np.empty((capacity, len(self.names)))
+        x[:self._size], y[:self._size] = self.x, self.values
+        self._x, self._y = x, y
+
+    def append(self, x: float, values: Dict[str, float]):
+        """
+        Adds one sample of every parameter at time x.
+
+        Args:
+            x: The shared x-coordinate (time).
+            values: Mapping of parameter name -> value; every parameter is required.
+        """
+        missing = [name for name in self.names if name not in values]
+        if missing:
+            raise ValueError(f"Missing values for: {', '.join(missing)}.")
+        self._reserve(self._size + 1)
+        self._x[self._size] = x
+        self._y[self._size] = [values[name] for name in self.names]
+        self._size += 1
+
+    def extend(self, x_values, rows):
+        """
+        Adds many samples at once.
+
+        Args:
+            x_values: Sequence of x-coordinates.
+            rows: (len(x_values), K) array-like, columns in the order of self.names.
+        """
+        import numpy as np
+
+        x = np.asarray(x_values, dtype=float).reshape(-1)
+        y = np.asarray(rows, dtype=float).reshape(len(x), len(self.names))
+        self._reserve(self._size + len(x))
+        self._x[self._size:self._size + len(x)] = x
+        self._y[self._size:self._size + len(x)] = y
+        self._size += len(x)
+
+    def forecast(self, targets, num_points: int = 5, method: str = 'Lagrange',
+                 routes: Optional[List[str]] = None) -> Tuple[Dict[str, 'np.ndarray'], Dict[str, 'np.ndarray'], int]:
+        """
+        Forecasts every parameter at the given x-values (see predict_columns).
+
+        Args:
+            targets: Sequence of x-values to predict.
+            num_points: Subset size per target; clamped to the available samples.
+            method: 'Lagrange', 'Divided Difference', 'Chebyshev' or 'Auto'.
+            routes: Optional list, filled with the engine that served each target.
+
+        Returns:
+            A tuple (predictions, uncertainties, number of distinct subsets); the
+            first two map each parameter name to an array with one value per target.
+        """
+        import numpy as np
+
+        if method not in COLUMN_ENGINES:
+            raise ValueError(f"Unknown extrapolation method: {method}")
+        if self._size < 2:
+            raise ValueError("Not enough data points collected for extrapolation (minimum 2 required).")
+        targets = np.asarray(targets, dtype=float).reshape(-1)
+        num_points = max(2, min(self._size, num_points))
+        y_predicted, uncertainty, num_subsets = predict_columns(
+            self.x, self.values, targets, num_points, method, routes
+        )
+        return (
+            {name: y_predicted[:, i] for i, name in enumerate(self.names)},
+            {name: uncertainty[:, i] for i, name in enumerate(self.names)},
+            num_subsets
+        )
@@ -0,0 +1,169 @@
+import json
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, List
+
+from koiRisk import STATUS_CODES, risk_level
+
+if TYPE_CHECKING:
+    import numpy as np
+    from trendCore import SmartTrendCore
+
+# Bumped whenever the array layout changes; load_snapshot rejects newer files
+SNAPSHOT_VERSION = 2
+
+# Prediction keys stored as columns; anything else goes to the JSON 'extra' map
+COLUMN_KEYS = ('x', 'y', 'method', 'subset_size', 'risk', 'solution', 'uncertainty', 'condition_number',
+               'subset_x', 'subset_y')
+
+
+def _encode_text(text: str) -> 'np.ndarray':
+    import numpy as np
+
+    return np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+
+
+def _decode_text(array) -> str:
+    return array.tobytes().decode('utf-8')
+
+
+def save_snapshot(core: 'SmartTrendCore', path: str, compress: bool = False):
+    """
+    Writes the session (data points, config and prediction history) as a
+    versioned NumPy .npz archive.
+
+    Data points and numeric prediction fields are stored as flat float64/int
+    columns; the config and the list of methods are small JSON blobs. Solution
+    texts are zlib-compressed into a single byte buffer with an offsets array,
+    and the subsets behind them (from which the full solutions are rebuilt) are
+    stored as flat float64 columns with their own offsets array.
+
+    Args:
+        core: The session to save.
+        path: Destination file; NumPy appends '.npz' if missing.
+        compress: Deflate the whole archive as well (smaller, slower to write).
+    """
+    import numpy as np
+
+    n = len(core.data_points)
+    predictions = core.predictions
+    methods: List[str] = sorted({p.get('method', '') for p in predictions})
+    method_index = {m: i for i, m in enumerate(methods)}
+
+    solutions = [p.get('solution', '').encode('utf-8') for p in predictions]
+    offsets = np.zeros(len(solutions) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in solutions], out=offsets[1:])
+    subsets = [p.get('subset_x', []) for p in predictions]
+    subset_offsets = np.zeros(len(subsets) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in subsets], out=subset_offsets[1:])
+    # Records that carry fields beyond the standard columns, by index
+    extra = {
+        str(i): {k: v for k, v in p.items() if k not in COLUMN_KEYS}
+        for i, p in enumerate(predictions)
+        if any(k not in COLUMN_KEYS for k in p)
+    }
+    meta = {
+        'config': dict(core.config, risk_thresholds=list(core.config['risk_thresholds'])),
+        'methods': methods,
+        'has_solution': [i for i, p in enumerate(predictions) if 'solution' in p],
+        'has_subset': [i for i, p in enumerate(predictions) if 'subset_x' in p],
+        'extra': extra
+    }
+
+    arrays = {
+        'version': np.array([SNAPSHOT_VERSION], dtype=np.int32),
+        'data_x': np.fromiter((p['x'] for p in core.data_points), dtype=float, count=n),
+        'data_y': np.fromiter((p['y'] for p in core.data_points), dtype=float, count=n),
+        'sample_flags': np.array(core.sample_flags, dtype=bool),
+        'meta': _encode_text(json.dumps(meta, default=float)),
+        'pred_x': np.array([p['x'] for p in predictions], dtype=float),
+        'pred_y': np.array([p['y'] for p in predictions], dtype=float),
+        'pred_method': np.array([method_index[p.get('method', '')] for p in predictions], dtype=np.int16),
+        'pred_subset_size': np.array([p.get('subset_size', 0) for p in predictions], dtype=np.int32),
+        'pred_risk': np.array([STATUS_CODES[p['risk']['status']] for p in predictions], dtype=np.int8),
+        'pred_uncertainty': np.array([p.get('uncertainty', np.nan) for p in predictions], dtype=float),
+        'pred_condition_number': np.array([p.get('condition_number', np.nan) for p in predictions], dtype=float),
+        'solution_offsets': offsets,
+        'solutions': np.frombuffer(zlib.compress(b''.join(solutions)), dtype=np.uint8),
+        'subset_offsets': subset_offsets,
+        'subset_x': np.fromiter((x for s in subsets for x in s), dtype=float, count=int(subset_offsets[-1])),
+        'subset_y': np.fromiter((y for p in predictions for y in p.get('subset_y', [])), dtype=float,
+                                count=int(subset_offsets[-1]))
+    }
+    (np.savez_compressed if compress else np.savez)(path, **arrays)
+
+
+def load_snapshot(path: str, core: 'SmartTrendCore'):
+    """
+    Restores a session written by save_snapshot into core, replacing its data
+    points, config and prediction history.
+
+    Args:
+        path: The .npz file to read.
+        core: The SmartTrendCore (or subclass) instance to fill.
+    """
+    import numpy as np
+
+    with np.load(path, allow_pickle=False) as archive:
+        version = int(archive['version'][0])
+        if version > SNAPSHOT_VERSION:
+            raise ValueError(f"Snapshot version {version} is newer than supported version {SNAPSHOT_VERSION}.")
+        meta = json.loads(_decode_text(archive['meta']))
+        data_x = archive['data_x'].tolist()
+        data_y = archive['data_y'].tolist()
+        sample_flags = archive['sample_flags'].tolist()
+        columns = {name: archive[f'pred_{name}'].tolist() for name in
+                   ('x', 'y', 'method', 'subset_size', 'risk', 'uncertainty', 'condition_number')}
+        offsets = archive['solution_offsets'].tolist()
+        solutions = zlib.decompress(archive['solutions'].tobytes())
+        # Version 1 snapshots carry no subsets
+        if version >= 2:
+            subset_offsets = archive['subset_offsets'].tolist()
+            subset_x = archive['subset_x'].tolist()
+            subset_y = archive['subset_y'].tolist()
+
+    config = meta['config']
+    config['risk_thresholds'] = tuple(config['risk_thresholds'])
+    methods = meta['methods']
+    has_solution = set(meta['has_solution'])
+    has_subset = set(meta.get('has_subset', []))
+
+    predictions: List[Dict[str, Any]] = []
+    for i, (x, y, method, subset_size, risk, uncertainty, condition_number) in enumerate(zip(
+            columns['x'], columns['y'], columns['method'], columns['subset_size'],
+            columns['risk'], columns['uncertainty'], columns['condition_number'])):
+        prediction = {
+            'x': x,
+            'y': y,
+            'method': methods[method],
+            'subset_size': subset_size,
+            'risk': risk_level(risk)
+        }
+        # NaN marks records saved without the field
+        if uncertainty == uncertainty:
+            prediction['uncertainty'] = uncertainty
+        if i in has_solution:
+            prediction['solution'] = solutions[offsets[i]:offsets[i + 1]].decode('utf-8')
+        if condition_number == condition_number:
+            prediction['condition_number'] = condition_number
+        if i in has_subset:
+            start, stop = subset_offsets[i], subset_offsets[i + 1]
+            prediction['subset_x'] = subset_x[start:stop]
+            prediction['subset_y'] = subset_y[start:stop]
+        prediction.update(meta['extra'].get(str(i), {}))
+        predictions.append(prediction)
+
+    core.data_points = [{'x': x, 'y': y} for x, y in zip(data_x, data_y)]
+    core.sample_flags = sample_flags
+    core.config.update(config)
+    core.predictions = predictions
+    core.solution_prediction = next((p for p in reversed(predictions) if 'solution' in p), None)
+    core.last_solution = core.solution_prediction['solution'] if core.solution_prediction else ""
+    # The streamed solution belongs to the replaced session's last extrapolation;
+    # iter_solution rebuilds the loaded one from its stored subset
+    core.solution_source = None
+    # Fitted state belongs to the session that produced it; re-run selection to rebuild it
+    core.subset = []
+    core.reserve_point = {}
+    core.fitted_model = {}
+    core.live_table = None
+    core.history = None
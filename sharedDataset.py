@@ -0,0 +1,134 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
+
+from trendCore import predict_targets
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Per-process cache of attached datasets, keyed by shared memory block name
+_attached: Dict[str, 'SharedDataset'] = {}
+
+
+class SharedDataset:
+    """
+    Float64 column buffers published in one multiprocessing.shared_memory block.
+    The small, picklable descriptor is all a worker needs to attach zero-copy
+    NumPy views of the columns.
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, length: int, names: Sequence[str], owner: bool):
+        import numpy as np
+
+        self.block = block
+        self.length = length
+        self.owner = owner
+        table = np.ndarray((len(names), length), dtype=np.float64, buffer=block.buf)
+        self.columns: Dict[str, 'np.ndarray'] = {name: table[i] for i, name in enumerate(names)}
+
+    @classmethod
+    def publish(cls, columns: Dict[str, Any]) -> 'SharedDataset':
+        """
+        Copies equal-length columns into a new shared memory block.
+
+        Args:
+            columns: Mapping of column name -> sequence of floats, e.g. {'x': ..., 'y': ...}.
+
+        Returns:
+            The owning SharedDataset; call unlink() (or use it as a context manager) when done.
+        """
+        import numpy as np
+
+        arrays = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+        lengths = {len(a) for a in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError("All shared columns must have the same length.")
+        length = lengths.pop()
+        block = shared_memory.SharedMemory(create=True, size=max(1, 8 * length * len(arrays)))
+        dataset = cls(block, length, list(arrays), owner=True)
+        for name, values in arrays.items():
+            dataset.columns[name][:] = values
+        return dataset
+
+    @classmethod
+    def attach(cls, descriptor: Dict[str, Any]) -> 'SharedDataset':
+        """Attaches to a published dataset from its descriptor without copying."""
+        if sys.version_info >= (3, 13):
+            # Only the publisher may unlink the block
+            block = shared_memory.SharedMemory(name=descriptor['name'], track=False)
+        else:
+            # Pool workers share the publisher's resource tracker, where the name is already registered
+            block = shared_memory.SharedMemory(name=descriptor['name'])
+        return cls(block, descriptor['length'], descriptor['columns'], owner=False)
+
+    @property
+    def descriptor(self) -> Dict[str, Any]:
+        """Picklable description of the block: name, length and column order."""
+        return {'name': self.block.name, 'length': self.length, 'columns': list(self.columns)}
+
+    def close(self):
+        """Releases this process's views and mapping of the block."""
+        self.columns = {}
+        self.block.close()
+
+    def unlink(self):
+        """Closes and destroys the block (publisher only)."""
+        self.close()
+        if self.owner:
+            self.block.unlink()
+
+    def __enter__(self) -> 'SharedDataset':
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+
+def predict_chunk(descriptor: Dict[str, Any], targets, num_points: int, method: str):
+    """
+    Worker entry point: attaches the shared dataset (once per process) and
+    runs subset selection + interpolation for a chunk of targets.
+
+    Returns:
+        A tuple (predicted values, uncertainty half-widths) for the chunk.
+    """
+    dataset = _attached.get(descriptor['name'])
+    if dataset is None:
+        dataset = _attached[descriptor['name']] = SharedDataset.attach(descriptor)
+    y_predicted, uncertainty, _ = predict_targets(
+        dataset.columns['x'], dataset.columns['y'], targets, num_points, method
+    )
+    return y_predicted, uncertainty
+
+
+def parallel_predict(dataset: SharedDataset, targets, num_points: int, method: str,
+                     processes: Optional[int] = None, chunk_size: int = 512):
+    """
+    Predicts many targets across a process pool that reads the data from shared memory.
+    Only the descriptor and each chunk of targets are pickled to the workers.
+
+    Args:
+        dataset: A published SharedDataset with 'x' and 'y' columns.
+        targets: Sequence of x-values to predict.
+        num_points: Subset size per target.
+        method: A key of trendCore.BATCH_ENGINES.
+        processes: Worker count; defaults to the CPU count.
+        chunk_size: Number of targets sent to a worker at a time.
+
+    Returns:
+        A tuple (predicted values, uncertainty half-widths) of arrays, in target order.
+    """
+    import numpy as np
+
+    targets = np.asarray(targets, dtype=float).reshape(-1)
+    chunks = [targets[i:i + chunk_size] for i in range(0, len(targets), chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+        results = list(pool.map(predict_chunk, repeat(dataset.descriptor), chunks,
+                                repeat(num_points), repeat(method)))
+    if not results:
+        return np.empty(0), np.empty(0)
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
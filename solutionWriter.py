@@ -0,0 +1,198 @@
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+# Summaries keep the first lines and the closing lines of a longer solution
+SUMMARY_HEAD_LINES = 120
+SUMMARY_TAIL_LINES = 8
+
+
+def _given_points(x_data: List[float], y_data: List[float], x_predict: float) -> Iterator[str]:
+    yield f"\nGiven Data Points (n = {len(x_data)}):"
+    for i, (x, y) in enumerate(zip(x_data, y_data)):
+        yield f"  P{i}: (x{i}, y{i}) = ({x:.4f}, {y:.4f})"
+    yield f"\nTarget X value to predict: x = {x_predict:.4f}"
+    yield "\n" + "-" * 50
+
+
+def lagrange_solution_lines(x_data: List[float], y_data: List[float], x_predict: float,
+                            weights: List[float], y_predicted: float) -> Iterator[str]:
+    """
+    Streams the step-by-step Lagrange solution.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+        x_predict: The x-value predicted.
+        weights: Basis values L_j(x_predict), as returned by lagrange.lagrange_weights.
+        y_predicted: The engine's predicted value.
+
+    Yields:
+        One line of the solution at a time, without trailing newlines.
+    """
+    n = len(x_data)
+    yield "=" * 50
+    yield "LAGRANGE INTERPOLATION - STEP BY STEP SOLUTION"
+    yield "=" * 50
+    yield from _given_points(x_data, y_data, x_predict)
+    yield "Lagrange Formula:"
+    yield "P(x) = SUM [y_j * L_j(x)]  for j = 0 to n-1"
+    yield "where L_j(x) = PRODUCT [(x - x_i) / (x_j - x_i)]  for i != j"
+    yield "-" * 50
+
+    for j in range(n):
+        yield f"\n--- Computing L_{j}(x) ---"
+        numerator_terms = ' * '.join(f"({x_predict:.4f} - {x_data[i]:.4f})" for i in range(n) if i != j)
+        yield f"L_{j}(x) = [{numerator_terms}]"
+        denominator_terms = ' * '.join(f"({x_data[j]:.4f} - {x_data[i]:.4f})" for i in range(n) if i != j)
+        yield f"         / [{denominator_terms}]"
+        yield f"L_{j}({x_predict:.4f}) = {weights[j]:.6f}"
+        yield f"y_{j} * L_{j}(x) = {y_data[j]:.4f} * {weights[j]:.6f} = {y_data[j] * weights[j]:.6f}"
+
+    yield "\n" + "=" * 50
+    yield "FINAL CALCULATION:"
+    yield f"P({x_predict:.4f}) = SUM [y_j * L_j(x)]"
+    terms_str = " + ".join(f"({y_data[j]:.4f} * L_{j})" for j in range(n))
+    yield f"P({x_predict:.4f}) = {terms_str}"
+    yield f"\nPREDICTED VALUE: P({x_predict:.4f}) = {y_predicted:.6f}"
+    yield "=" * 50
+
+
+def divided_difference_solution_lines(x_data: List[float], y_data: List[float], x_predict: float,
+                                      table: List[List[float]], horner_steps: List[float]) -> Iterator[str]:
+    """
+    Streams the step-by-step Newton's Divided Difference solution.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+        x_predict: The x-value predicted.
+        table: Divided difference table, as returned by dividedDifference.divided_difference_table.
+        horner_steps: Successive Horner values, as returned by dividedDifference.newton_horner_steps.
+
+    Yields:
+        One line of the solution at a time, without trailing newlines.
+    """
+    n = len(x_data)
+    coefficients = [column[0] for column in table]
+    yield "=" * 50
+    yield "NEWTON'S DIVIDED DIFFERENCE - STEP BY STEP SOLUTION"
+    yield "=" * 50
+    yield from _given_points(x_data, y_data, x_predict)
+    yield "Divided Difference Formula:"
+    yield "P(x) = f[x0] + f[x0,x1](x-x0) + f[x0,x1,x2](x-x0)(x-x1) + ..."
+    yield "-" * 50
+
+    yield "\n--- Building Divided Difference Table ---"
+    yield f"\nOrder 0 (f[x_i] = y_i):"
+    for i in range(n):
+        yield f"  f[x{i}] = {table[0][i]:.6f}"
+
+    for j in range(1, n):
+        yield f"\nOrder {j} Divided Differences:"
+        previous, current = table[j-1], table[j]
+        # table[j][i - j] = f[x_{i-j},...,x_i]
+        for i in range(n - 1, j - 1, -1):
+            yield (f"  f[x{i-j},...,x{i}] = ({previous[i-j+1]:.6f} - {previous[i-j]:.6f}) "
+                   f"/ ({x_data[i]:.4f} - {x_data[i-j]:.4f})")
+            yield f"                    = {current[i-j]:.6f}"
+
+    yield "\n--- Coefficients for Newton's Polynomial ---"
+    for j, c in enumerate(coefficients):
+        yield f"  c{j} = {c:.6f}"
+
+    yield f"\n--- Evaluating P({x_predict:.4f}) using Horner's Method ---"
+    yield f"Starting with c{n-1} = {horner_steps[0]:.6f}"
+    for step, i in enumerate(range(n - 2, -1, -1)):
+        yield (f"P = {horner_steps[step]:.6f} * ({x_predict:.4f} - {x_data[i]:.4f}) "
+               f"+ {coefficients[i]:.6f} = {horner_steps[step + 1]:.6f}")
+
+    yield "\n" + "=" * 50
+    yield f"PREDICTED VALUE: P({x_predict:.4f}) = {horner_steps[-1]:.6f}"
+    yield "=" * 50
+
+
+def chebyshev_solution_lines(x_data: List[float], y_data: List[float], x_predict: float,
+                             fit: Dict[str, Any], basis: List[float], y_predicted: float) -> Iterator[str]:
+    """
+    Streams the step-by-step Chebyshev (normalized basis) solution.
+
+    Args:
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+        x_predict: The x-value predicted.
+        fit: The engine's fit, as returned by chebyshev.chebyshev_fit.
+        basis: Basis values T_k(t) at the target, as returned by chebyshev.chebyshev_basis.
+        y_predicted: The engine's predicted value.
+
+    Yields:
+        One line of the solution at a time, without trailing newlines.
+    """
+    centre, scale = fit['centre'], fit['scale']
+    t_predict = (x_predict - centre) / scale
+    yield "=" * 50
+    yield "CHEBYSHEV BASIS FIT - STEP BY STEP SOLUTION"
+    yield "=" * 50
+    yield from _given_points(x_data, y_data, x_predict)
+    yield "Normalization:"
+    yield "t = (x - c) / h  with  c = (max x + min x) / 2,  h = (max x - min x) / 2"
+    yield f"c = {centre:.4f}, h = {scale:.4f}"
+    yield "Chebyshev Formula:"
+    yield "P(t) = SUM [a_k * T_k(t)]  for k = 0 to n-1"
+    yield "where T_0 = 1, T_1 = t, T_k = 2t*T_(k-1) - T_(k-2)"
+    yield "-" * 50
+
+    yield "\n--- Normalized Nodes ---"
+    for i, x in enumerate(x_data):
+        yield f"  t{i} = ({x:.4f} - {centre:.4f}) / {scale:.4f} = {(x - centre) / scale:.6f}"
+
+    yield "\n--- Coefficients (QR solve of T_k(t_i) * a = y) ---"
+    for k, a in enumerate(fit['coef']):
+        yield f"  a{k} = {a:.6f}"
+    yield f"Condition number estimate: {fit['condition_number']:.3e}"
+
+    yield f"\n--- Evaluating at t = {t_predict:.6f} ---"
+    for k, (a, T) in enumerate(zip(fit['coef'], basis)):
+        yield f"a{k} * T_{k}(t) = {a:.6f} * {T:.6f} = {a * T:.6f}"
+
+    yield "\n" + "=" * 50
+    yield f"PREDICTED VALUE: P({x_predict:.4f}) = {y_predicted:.6f}"
+    yield "=" * 50
+
+
+def write_solution(lines: Iterable[str], stream: TextIO) -> int:
+    """
+    Writes solution lines to a text stream (an open file, sys.stdout, or a
+    socket's makefile('w')) as they are produced.
+
+    Returns:
+        The number of lines written.
+    """
+    count = 0
+    for line in lines:
+        stream.write(line)
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def summarize_solution(lines: Iterable[str], head: int = SUMMARY_HEAD_LINES,
+                       tail: int = SUMMARY_TAIL_LINES) -> str:
+    """
+    Builds a bounded summary of a solution: its first `head` and last `tail`
+    lines, with a marker for the omitted middle. Shorter solutions are returned
+    in full. Only head + tail lines are held in memory.
+    """
+    kept: List[str] = []
+    last = deque(maxlen=tail)
+    total = 0
+    for line in lines:
+        total += 1
+        if total <= head:
+            kept.append(line)
+        else:
+            last.append(line)
+    omitted = total - head - len(last)
+    if omitted > 0:
+        kept.append(f"\n... {omitted} lines omitted; export the results for the full solution ...")
+    kept.extend(last)
+    return "\n".join(kept)
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+from ingestService import IngestService
+
+
+async def _exchange(port: int, messages):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    replies = []
+    for message in messages:
+        writer.write(json.dumps(message).encode() + b'\n')
+        await writer.drain()
+        replies.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+    writer.close()
+    return replies
+
+
+def test_bad_batch_does_not_stop_ingestion():
+    async def scenario():
+        service = IngestService(num_points=3, queue_size=2)
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        bad = {'readings': [['a', 2, None], ['a', 'x', 1.0], [['id'], 1, 2], ['a', 1], 'a', ['a', 1, float('nan')]]}
+        good = [{'readings': [[7, float(b * 2 + i), 6.0 + 0.5 * i] for i in range(2)]} for b in range(10)]
+        replies = await _exchange(port, [bad] + good + [{'predict': 7, 'horizon': 1.0}])
+        await asyncio.wait_for(service.stop(), 5)
+        return service, replies
+
+    service, replies = asyncio.run(scenario())
+    assert replies[0] == {'ok': True, 'accepted': 0, 'rejected': 6}
+    assert all(reply == {'ok': True, 'accepted': 2, 'rejected': 0} for reply in replies[1:-1])
+    assert service.stats['readings'] == 20
+    assert service.stats['rejected'] == 6
+    assert replies[-1]['sensor'] == '7'
+    assert replies[-1]['subset_size'] == 3
+
+
+def test_ingest_skips_invalid_readings():
+    service = IngestService(num_points=2)
+    service.ingest([['a', 0.0, 5.0], ['a', None, 5.0], ['a', 0.0, 6.0], ['a', 1.0, 6.0]])
+    assert (service.stats['readings'], service.stats['rejected'], service.stats['batches']) == (2, 2, 1)
+    assert service.predict('a', 1.0)['y'] == 7.0
+
+
+def test_oversized_requests_get_an_error_reply():
+    async def scenario():
+        service = IngestService(num_points=3, max_request_bytes=16 * 1024)
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        replies = {}
+
+        # A batch under the limit but over asyncio's old 64 KiB default is accepted
+        large = IngestService(num_points=3)
+        large_server = await large.start('127.0.0.1', 0)
+        readings = [['pond-0001', float(i), 6.0 + 0.001 * i] for i in range(2600)]
+        replies['large'] = (await _exchange(large_server.sockets[0].getsockname()[1], [{'readings': readings}]))[0]
+        await asyncio.wait_for(large.stop(), 5)
+
+        # Over the limit on the line protocol: an error reply, then the connection closes
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(json.dumps({'readings': readings}).encode() + b'\n')
+        await writer.drain()
+        replies['line'] = json.loads(await asyncio.wait_for(reader.readline(), 5))
+        writer.close()
+
+        # Over the limit over HTTP: refused from the Content-Length, body never read
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"POST /readings HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n")
+        await writer.drain()
+        replies['http'] = (await asyncio.wait_for(reader.read(), 5)).split(b'\r\n', 1)[0]
+        writer.close()
+
+        # A malformed request line is a 400, not an unhandled exception
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b"GET \r\n\r\n")
+        await writer.drain()
+        replies['bad_line'] = (await asyncio.wait_for(reader.read(), 5)).split(b'\r\n', 1)[0]
+        writer.close()
+
+        replies['after'] = (await _exchange(port, [{'readings': [['s', 1.0, 6.0]]}]))[0]
+        await asyncio.wait_for(service.stop(), 5)
+        return large, service, replies
+
+    large, service, replies = asyncio.run(scenario())
+    assert replies['large'] == {'ok': True, 'accepted': 2600, 'rejected': 0}
+    assert large.stats['readings'] == 2600
+    assert 'exceeds' in replies['line']['error']
+    assert replies['http'] == b'HTTP/1.1 413 Payload Too Large'
+    assert replies['bad_line'] == b'HTTP/1.1 400 Bad Request'
+    assert replies['after'] == {'ok': True, 'accepted': 1, 'rejected': 0}
+    assert service.stats['readings'] == 1
@@ -0,0 +1,33 @@
+import pytest
+
+import kernels
+from lagrange import lagrange_interpolation
+from dividedDifference import divided_difference_interpolation
+
+
+@pytest.fixture(params=['numba', 'python'])
+def kernel_backend(request, monkeypatch):
+    if request.param == 'numba':
+        pytest.importorskip('numba')
+        monkeypatch.delenv(kernels.KERNELS_ENV, raising=False)
+    else:
+        monkeypatch.setenv(kernels.KERNELS_ENV, 'python')
+    # Kernels are compiled (or skipped) on first use; start each backend afresh
+    monkeypatch.setattr(kernels, '_compiled', None)
+    yield request.param
+    kernels._compiled = None
+
+
+def test_backend_selected(kernel_backend):
+    assert kernels.backend() == kernel_backend
+
+
+def test_kernels_match_reference_bit_for_bit(kernel_backend):
+    assert kernels.verify_kernels(trials=500, seed=1) == 500
+
+
+def test_identical_x_values_rejected(kernel_backend):
+    with pytest.raises(ValueError):
+        lagrange_interpolation([1.0, 2.0, 2.0], [3.0, 4.0, 5.0], 4.0)
+    with pytest.raises(ValueError):
+        divided_difference_interpolation([1.0, 2.0, 2.0], [3.0, 4.0, 5.0], 4.0)
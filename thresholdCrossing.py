@@ -0,0 +1,103 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from dividedDifference import newton_evaluate
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def newton_value_and_slope(x_data: List[float], coef: List[float], x: float) -> Tuple[float, float]:
+    """
+    Evaluates a Newton-form polynomial and its first derivative at x in one Horner pass.
+
+    Args:
+        x_data: The nodes the coefficients were built on.
+        coef: Newton coefficients as returned by divided_difference_coefficients.
+        x: The point of evaluation.
+
+    Returns:
+        A tuple (P(x), P'(x)).
+    """
+    n = len(coef)
+    P_x = coef[n-1]
+    slope = 0.0
+    for i in range(n - 2, -1, -1):
+        slope = slope * (x - x_data[i]) + P_x
+        P_x = P_x * (x - x_data[i]) + coef[i]
+    return P_x, slope
+
+
+def refine_crossing(x_data: List[float], coef: List[float], level: float,
+                    lo: float, hi: float, tol: float = 1e-12, max_iter: int = 50) -> float:
+    """
+    Locates P(x) = level inside a bracket [lo, hi] using Newton steps safeguarded by bisection.
+
+    Args:
+        x_data: The nodes the coefficients were built on.
+        coef: Newton coefficients of the fitted polynomial.
+        level: The y-value being crossed.
+        lo: Bracket end where P(x) - level has one sign.
+        hi: Bracket end where P(x) - level has the opposite sign (or is zero).
+        tol: Absolute tolerance on x, relative to the bracket width.
+        max_iter: Iteration cap.
+
+    Returns:
+        The x-value of the crossing.
+    """
+    f_lo = newton_value_and_slope(x_data, coef, lo)[0] - level
+    if f_lo == 0:
+        return lo
+    width_tol = tol * max(1.0, abs(hi - lo))
+    x = 0.5 * (lo + hi)
+    for _ in range(max_iter):
+        P_x, slope = newton_value_and_slope(x_data, coef, x)
+        f_x = P_x - level
+        if f_x == 0:
+            return x
+        # Keep the bracket [lo, hi] around the sign change
+        if (f_x < 0) == (f_lo < 0):
+            lo, f_lo = x, f_x
+        else:
+            hi = x
+        step = x - f_x / slope if slope != 0 else None
+        if step is None or not (min(lo, hi) < step < max(lo, hi)):
+            step = 0.5 * (lo + hi)
+        if abs(step - x) <= width_tol or abs(hi - lo) <= width_tol:
+            return step
+        x = step
+    return x
+
+
+def find_threshold_crossings(x_data: List[float], coef: List[float], start_x: float, end_x: float,
+                             thresholds: Sequence[float], grid_points: int = 64) -> Dict[float, Optional[float]]:
+    """
+    Finds the earliest x in (start_x, end_x] at which the fitted curve crosses each threshold.
+    Crossings are bracketed on a coarse grid evaluated in one vectorized call, then refined.
+
+    Args:
+        x_data: The nodes the coefficients were built on.
+        coef: Newton coefficients of the fitted polynomial.
+        start_x: Beginning of the search window (usually the current time).
+        end_x: End of the search window (usually the prediction target).
+        thresholds: The y-levels to look for, e.g. the Koi risk thresholds.
+        grid_points: Number of grid points used for bracketing.
+
+    Returns:
+        A mapping of threshold -> crossing x, or None if it is not crossed in the window.
+    """
+    import numpy as np
+
+    levels = np.asarray(thresholds, dtype=float)
+    grid = np.linspace(start_x, end_x, max(2, grid_points))
+    above = newton_evaluate(x_data, coef, grid)[None, :] >= levels[:, None]
+    changes = above[:, 1:] != above[:, :-1]
+    has_crossing = changes.any(axis=1)
+    first = changes.argmax(axis=1)
+
+    crossings: Dict[float, Optional[float]] = {}
+    for level, crossed, i in zip(levels.tolist(), has_crossing, first):
+        if not crossed:
+            crossings[level] = None
+            continue
+        crossings[level] = refine_crossing(x_data, coef, level, float(grid[i]), float(grid[i + 1]))
+    return crossings
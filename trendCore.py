@@ -0,0 +1,854 @@
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from lagrange import lagrange_combine, lagrange_interpolation_many, lagrange_weights
+from dividedDifference import (
+    divided_difference_interpolation_many,
+    divided_difference_table,
+    newton_fit,
+    newton_horner_steps,
+    newton_remainder_evaluate,
+    newton_terms,
+    NewtonTable,
+)
+from chebyshev import chebyshev_basis, chebyshev_fit, chebyshev_evaluate, chebyshev_interpolation_many
+from outlierFilter import hampel_flags
+from resample import resample_series, AGGREGATIONS
+from selection import predict_by_subset
+from metrics import REGISTRY
+from dispatcher import DISPATCHER, ENGINE_METHODS, SCALAR_ENGINES, auto_interpolation_many
+from downsample import DownsamplePyramid
+from sensitivity import SENSITIVITY_MAX_SIZE, sensitivity_grid
+from koiRisk import RISK_THRESHOLDS, classify_koi_risk, koi_risk_code, risk_level
+from thresholdCrossing import find_threshold_crossings
+from solutionWriter import (
+    chebyshev_solution_lines,
+    divided_difference_solution_lines,
+    lagrange_solution_lines,
+    summarize_solution,
+    write_solution,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# Vectorized engines evaluating many targets that share one subset
+# (Chebyshev also returns the condition number of its fit)
+BATCH_ENGINES = {
+    'Lagrange': lagrange_interpolation_many,
+    'Divided Difference': divided_difference_interpolation_many,
+    'Chebyshev': chebyshev_interpolation_many,
+    'Auto': auto_interpolation_many
+}
+
+
+def predict_targets(x_all, y_all, targets, num_points: int, method: str, routes: Optional[List[str]] = None,
+                    condition_numbers: Optional[List[float]] = None):
+    """
+    Selects a subset per target and extrapolates all targets in a batched pass.
+    Targets whose nearest points coincide share a single fit, and each distinct
+    subset is evaluated for all its targets at once.
+    
+    Args:
+        x_all: float64 array of (preprocessed) x-values.
+        y_all: float64 array of y-values.
+        targets: Array of x-values to predict.
+        num_points: Subset size per target (2 <= num_points <= len(x_all)).
+        method: A key of BATCH_ENGINES.
+        routes: Optional list, filled with the engine that served each target
+                (the dispatcher's choice for 'Auto', otherwise the method itself).
+        condition_numbers: Optional list, filled with the condition number of the
+                           fit behind each target ('Chebyshev' only; NaN otherwise).
+        
+    Returns:
+        A tuple (predicted values, uncertainty half-widths, number of distinct subsets).
+    """
+    engine = BATCH_ENGINES[method]
+    nan = float('nan')
+
+    def evaluate(x, y, t, x_reserve, y_reserve):
+        # One Newton fit per subset gives every target's band against its own reserve point
+        estimate, band = newton_remainder_evaluate(newton_fit(x, y), t, x_reserve, y_reserve)
+        if method == 'Divided Difference':
+            # The Newton fit is the engine: its estimate is the prediction
+            return estimate, band, (method, nan)
+        if method == 'Auto':
+            values, route = DISPATCHER.interpolate_many(x, y, t)
+            return values, band, (route, nan)
+        if method == 'Chebyshev':
+            values, condition_number = engine(x, y, t)
+            return values, band, (method, condition_number)
+        return engine(x, y, t), band, (method, nan)
+
+    y_predicted, uncertainty, info, num_subsets = predict_by_subset(x_all, y_all, targets, num_points, evaluate)
+    if routes is not None:
+        routes[:] = [route for route, _ in info]
+    if condition_numbers is not None:
+        condition_numbers[:] = [condition_number for _, condition_number in info]
+    return y_predicted, uncertainty, num_subsets
+
+
+def solve_with_solution(method: str, x_data: List[float], y_data: List[float],
+                        x_predict: float) -> Tuple[float, Callable[[], Iterator[str]], Dict[str, Any]]:
+    """
+    Extrapolates one target with a scalar engine and keeps the engine's
+    intermediate numbers (Lagrange basis values, divided difference table and
+    Horner steps, or the Chebyshev fit), so the step-by-step solution is rendered
+    from them instead of interpolating a second time.
+    
+    Args:
+        method: 'Lagrange', 'Divided Difference' or 'Chebyshev'.
+        x_data: List of x-coordinates (time).
+        y_data: List of y-coordinates (value).
+        x_predict: The x-value for which to predict y.
+        
+    Returns:
+        A tuple (predicted value, zero-argument callable streaming the solution
+        lines, extra prediction fields such as the Chebyshev condition number).
+    """
+    if method == 'Lagrange':
+        weights = lagrange_weights(x_data, x_predict)
+        y_predicted = lagrange_combine(y_data, weights)
+        source = partial(lagrange_solution_lines, x_data, y_data, x_predict, weights, y_predicted)
+        return y_predicted, source, {}
+    if method == 'Divided Difference':
+        table = divided_difference_table(x_data, y_data)
+        steps = newton_horner_steps(x_data, [column[0] for column in table], x_predict)
+        source = partial(divided_difference_solution_lines, x_data, y_data, x_predict, table, steps)
+        return steps[-1], source, {}
+    if method == 'Chebyshev':
+        fit = chebyshev_fit(x_data, y_data)
+        y_predicted = float(chebyshev_evaluate(fit, x_predict))
+        basis = chebyshev_basis(fit, x_predict).tolist()
+        source = partial(chebyshev_solution_lines, x_data, y_data, x_predict, fit, basis, y_predicted)
+        return y_predicted, source, {'condition_number': fit['condition_number']}
+    raise ValueError(f"Unknown extrapolation method: {method}")
+
+
+class SmartTrendCore:
+    """
+    Headless core of the SmartTrend Extrapolation Program.
+    Handles data collection, configuration, subset selection, risk assessment
+    and Lagrange / Divided Difference extrapolation, without console I/O.
+    Progress messages go through log(), which is silent by default.
+    """
+
+    def __init__(self):
+        # Time-series data points: [{'x': time, 'y': value}, ...]
+        self.data_points: List[Dict[str, float]] = []
+        # Configuration settings
+        self.config: Dict[str, Any] = {
+            'x_title': 'Time',
+            'y_title': 'Value',
+            'method': 'Lagrange', # Default method
+            'num_points': 5,      # Default number of points for subset
+            'extrapolation_value': None, # The future x-value to predict
+            'risk_thresholds': RISK_THRESHOLDS, # DO band boundaries (mg/L)
+            'outlier_filter': None, # {'window': ..., 'n_sigmas': ..., 'drop': ...} Hampel stage
+            'resample': None # {'cadence': ..., 'how': ...} to bin data before selection
+        }
+        # The subset of points selected for extrapolation
+        self.subset: List[Dict[str, float]] = []
+        # The next-closest point outside the subset, held back for error estimates
+        self.reserve_point: Dict[str, float] = {}
+        # Predicted outputs
+        self.predictions: List[Dict[str, float]] = []
+        self.last_solution: str = ""  # Store the solution steps (summary for long solutions)
+        # Re-creates the full solution of the last extrapolation from the engine's numbers
+        self.solution_source: Optional[Callable[[], Iterator[str]]] = None
+        self.solution_prediction: Optional[Dict[str, Any]] = None
+        # Anomaly flag per entry of data_points, set by the outlier filter stage
+        self.sample_flags: List[bool] = []
+        # Per-stage counters and latency histograms (no-op unless enabled)
+        self.metrics = REGISTRY
+        # Newton form of the last fitted polynomial: {'x': nodes, 'coef': coefficients}
+        self.fitted_model: Dict[str, List[float]] = {}
+        # Incrementally updated Newton table behind live mode (newest num_points + 1 samples)
+        self.live_table: Optional[NewtonTable] = None
+        # Downsampling pyramid of the raw history for plotting, built on first use
+        self.history: Optional[DownsamplePyramid] = None
+
+    def log(self, message: str):
+        """Receives progress messages; override to print or record them."""
+
+    def show_solution(self):
+        """
+        Presents the solution of the last extrapolation. Logs the bounded summary
+        by default; front ends with a stream to write to (e.g. the CLI's stdout)
+        override this and call write_solution for the full text.
+        """
+        self.log(self.last_solution)
+
+    def collect_data_points(self, data: List[Tuple[float, float]]):
+        """
+        Collects initial time-series data points (x, y).
+        
+        Args:
+            data: A list of (x, y) tuples representing the historical data.
+        """
+        self.log("--- Data Collection ---")
+        with self.metrics.stage('collect'):
+            self.data_points = [{'x': x, 'y': y} for x, y in data]
+        self.history = None
+        # Flags belong to the data they were computed on; prepare_arrays refreshes them
+        self.sample_flags = []
+        self.log(f"Collected {len(self.data_points)} data points.")
+
+    def get_max_x(self) -> float:
+        """Returns the largest X value in the current data set; 0 if empty."""
+        return max((p['x'] for p in self.data_points), default=0)
+
+    def set_prediction_horizon(self, horizon_value: float) -> float:
+        """Sets extrapolation target based on a horizon added to the current max X."""
+        max_x = self.get_max_x()
+        target_x = max_x + horizon_value
+        self.config['extrapolation_value'] = target_x
+        self.log(f"Horizon set: +{horizon_value} (Target X={target_x})")
+        return target_x
+
+    def set_configuration(self, x_title: str, y_title: str, method: str, num_points: int, predict_x: float):
+        """
+        Inputs additional details for the extrapolation process.
+        
+        Args:
+            x_title: Title for the x-axis (e.g., 'Time in Hours').
+            y_title: Title for the y-axis (e.g., 'Temperature in C').
+            method: Extrapolation method ('Lagrange', 'Divided Difference' or 'Chebyshev').
+            num_points: The number of closest points to use (Min 2, Max available data points).
+            predict_x: The x-value for which to predict the y-value.
+        """
+        self.log("--- Configuration Setup ---")
+        self.config['extrapolation_value'] = predict_x
+        self.config['x_title'] = x_title
+        self.config['y_title'] = y_title
+        self.config['method'] = method
+        # Clamp num_points between 2 and total available data points
+        max_points = len(self.data_points)
+        self.config['num_points'] = max(2, min(max_points, num_points))
+        self.log(f"Method: {self.config['method']}, Subset Size: {self.config['num_points']}, Predict at X={predict_x}")
+
+    def set_resampling(self, cadence, how: str = 'mean'):
+        """
+        Enables the resampling stage that runs before subset selection.
+        
+        Args:
+            cadence: Bin width in x units; None only merges duplicate x-values.
+            how: Aggregation per bin ('mean', 'median' or 'last').
+        """
+        if how not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {how}. Expected one of {', '.join(AGGREGATIONS)}.")
+        self.config['resample'] = {'cadence': cadence, 'how': how}
+        self.log(f"Resampling: cadence={cadence}, aggregation={how}")
+
+    def set_outlier_filter(self, window: int = 7, n_sigmas: float = 3.0, drop: bool = True):
+        """
+        Enables the Hampel outlier stage that runs before resampling and selection.
+        
+        Args:
+            window: Number of preceding samples (in x order) each value is compared against.
+            n_sigmas: Threshold in scaled median absolute deviations.
+            drop: If True flagged samples are removed; otherwise they are only flagged.
+        """
+        self.config['outlier_filter'] = {'window': window, 'n_sigmas': n_sigmas, 'drop': drop}
+        self.sample_flags = []
+        self.log(f"Outlier filter: Hampel window={window}, n_sigmas={n_sigmas}, drop={drop}")
+
+    def prepare_arrays(self):
+        """
+        Runs the preprocessing stages over the collected data.
+        
+        Returns:
+            A tuple (x, y) of float64 arrays ready for subset selection.
+        """
+        import numpy as np
+
+        n = len(self.data_points)
+        x = np.fromiter((p['x'] for p in self.data_points), dtype=float, count=n)
+        y = np.fromiter((p['y'] for p in self.data_points), dtype=float, count=n)
+
+        stage = self.config['outlier_filter']
+        if stage:
+            order = np.argsort(x, kind='stable')
+            flags = np.empty(n, dtype=bool)
+            flags[order] = hampel_flags(y[order], stage['window'], stage['n_sigmas'])
+            self.sample_flags = flags.tolist()
+            self.log(f"Outlier filter flagged {int(flags.sum())} of {n} samples.")
+            if stage['drop']:
+                x, y = x[~flags], y[~flags]
+
+        stage = self.config['resample']
+        if stage:
+            x, y = resample_series(x, y, stage['cadence'], stage['how'])
+        return x, y
+
+    def prepare_points(self) -> List[Dict[str, float]]:
+        """Returns the preprocessed data points; the raw list when no stage is configured."""
+        if not self.config['resample'] and not self.config['outlier_filter']:
+            return self.data_points
+        x, y = self.prepare_arrays()
+        return [{'x': px, 'y': py} for px, py in zip(x.tolist(), y.tolist())]
+
+    def share_dataset(self):
+        """
+        Publishes the preprocessed data as shared memory columns 'x' and 'y'
+        for process-pool workers (see sharedDataset.parallel_predict).
+        
+        Returns:
+            The owning SharedDataset; unlink it when the workers are done.
+        """
+        from sharedDataset import SharedDataset
+
+        x, y = self.prepare_arrays()
+        return SharedDataset.publish({'x': x, 'y': y})
+
+    def save_session(self, path: str, compress: bool = False):
+        """
+        Saves data points, config and prediction history as a binary snapshot
+        (see sessionSnapshot.save_snapshot).
+        
+        Args:
+            path: Destination .npz file.
+            compress: Deflate the archive as well.
+        """
+        from sessionSnapshot import save_snapshot
+
+        save_snapshot(self, path, compress)
+        self.log(f"Session saved to {path} ({len(self.data_points)} points, {len(self.predictions)} predictions).")
+
+    def load_session(self, path: str):
+        """
+        Replaces the current session with one saved by save_session.
+        
+        Args:
+            path: The .npz file to read.
+        """
+        from sessionSnapshot import load_snapshot
+
+        load_snapshot(path, self)
+        self.log(f"Session loaded from {path} ({len(self.data_points)} points, {len(self.predictions)} predictions).")
+
+    def history_view(self, x_min: float, x_max: float, width: int):
+        """
+        Returns the raw history on [x_min, x_max] downsampled to about `width`
+        samples (see downsample.DownsamplePyramid). The pyramid is built once per
+        data set and reused across pans and zooms.
+        
+        Args:
+            x_min: Left edge of the visible range.
+            x_max: Right edge of the visible range.
+            width: Width of the plot area in pixels.
+            
+        Returns:
+            A tuple (x, y) of arrays, sorted by x.
+        """
+        if self.history is None:
+            import numpy as np
+
+            n = len(self.data_points)
+            self.history = DownsamplePyramid(
+                np.fromiter((p['x'] for p in self.data_points), dtype=float, count=n),
+                np.fromiter((p['y'] for p in self.data_points), dtype=float, count=n)
+            )
+        return self.history.view(x_min, x_max, width)
+
+    def select_extrapolation_subset(self):
+        """
+        Selects the specified number of data points closest to the prediction X value.
+        """
+        N = self.config['num_points']
+        x_predict = self.config['extrapolation_value']
+        with self.metrics.stage('preprocess'):
+            points = self.prepare_points()
+        
+        if len(points) < 2:
+            raise ValueError("Not enough data points collected for extrapolation (minimum 2 required).")
+
+        with self.metrics.stage('select'):
+            # Sort data by distance from prediction point
+            sorted_data = sorted(points, key=lambda p: abs(p['x'] - x_predict))
+            
+            # Select the N closest points
+            self.subset = sorted_data[:N]
+            self.reserve_point = sorted_data[N] if len(sorted_data) > N else {}
+            # The fitted model belongs to the previous subset
+            self.fitted_model = {}
+        self.log(f"Selected {len(self.subset)} data points closest to X={x_predict}:")
+        for p in self.subset:
+            self.log(f"  ({p['x']:.2f}, {p['y']:.2f})")
+
+    def assess_koi_risk(self, do_value: float) -> dict:
+        """Assess dissolved oxygen risk level for Koi fish health."""
+        return risk_level(koi_risk_code(do_value, self.config['risk_thresholds']))
+
+    def assess_koi_risk_many(self, do_values) -> 'np.ndarray':
+        """Classifies an array of DO values into risk codes (see koiRisk.RISK_LEVELS)."""
+        return classify_koi_risk(do_values, self.config['risk_thresholds'])
+
+    def generate_lagrange_solution(self, x_data: List[float], y_data: List[float], x_predict: float) -> str:
+        """Generate step-by-step Lagrange interpolation solution."""
+        return "\n".join(solve_with_solution('Lagrange', x_data, y_data, x_predict)[1]())
+
+    def generate_divided_diff_solution(self, x_data: List[float], y_data: List[float], x_predict: float) -> str:
+        """Generate step-by-step Divided Difference interpolation solution."""
+        return "\n".join(solve_with_solution('Divided Difference', x_data, y_data, x_predict)[1]())
+
+    def generate_chebyshev_solution(self, x_data: List[float], y_data: List[float], x_predict: float,
+                                    fit: Dict[str, Any]) -> str:
+        """Generate step-by-step Chebyshev (normalized basis) solution."""
+        basis = chebyshev_basis(fit, x_predict).tolist()
+        y_predicted = float(chebyshev_evaluate(fit, x_predict))
+        return "\n".join(chebyshev_solution_lines(x_data, y_data, x_predict, fit, basis, y_predicted))
+
+    def iter_solution(self, prediction: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Streams the full step-by-step solution of a prediction, line by line.
+        The last extrapolation's solution is regenerated from the numbers its engine
+        computed. Other extrapolations (including reloaded ones) are re-solved from
+        their stored subset, which gives the same numbers; records without one fall
+        back to their stored solution text.
+        
+        Args:
+            prediction: A prediction record; defaults to the last extrapolation.
+        """
+        if prediction is None:
+            prediction = self.solution_prediction
+            if prediction is None:
+                return iter(self.last_solution.split("\n"))
+        if self.solution_source is not None and prediction is self.solution_prediction:
+            return self.solution_source()
+        if 'subset_x' in prediction:
+            method = ENGINE_METHODS[prediction['engine']] if prediction['method'] == 'Auto' else prediction['method']
+            return solve_with_solution(method, prediction['subset_x'], prediction['subset_y'], prediction['x'])[1]()
+        return iter(prediction.get('solution', "").split("\n"))
+
+    def write_solution(self, stream: TextIO, prediction: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Writes the full solution of a prediction to an open text stream as it is generated.
+        
+        Returns:
+            The number of lines written.
+        """
+        return write_solution(self.iter_solution(prediction), stream)
+
+    def extrapolate_and_store(self):
+        """
+        Executes the selected extrapolation method on the data subset 
+        and stores the resulting prediction.
+        """
+        if not self.subset:
+            self.log("Error: No subset selected. Run select_extrapolation_subset first.")
+            return
+
+        x_data = [p['x'] for p in self.subset]
+        y_data = [p['y'] for p in self.subset]
+        x_predict = self.config['extrapolation_value']
+        
+        if x_predict is None:
+            self.log("Error: Extrapolation target value (predict_x) is not set.")
+            return
+
+        self.log(f"--- Performing Extrapolation ({self.config['method']}) ---")
+        
+        method = self.config['method']
+        metrics = self.metrics
+        try:
+            engine = None
+            if method == 'Auto':
+                # A single target solved step by step: only the scalar engines
+                # (weights or Horner) run here, so route among those
+                engine = DISPATCHER.route(len(x_data), 1, SCALAR_ENGINES)
+                method = ENGINE_METHODS[engine]
+                self.log(f"Auto dispatch: {engine} ({method})")
+
+            with metrics.stage('interpolate'):
+                y_predicted, source, details = solve_with_solution(method, x_data, y_data, x_predict)
+
+            with metrics.stage('solution'):
+                # Only a bounded summary is kept as text; iter_solution streams the rest
+                self.last_solution = summarize_solution(source())
+            
+            with metrics.stage('uncertainty'):
+                # One scaled Newton fit serves threshold queries, the plotted curve
+                # and the band (see evaluate_with_uncertainty)
+                self.fitted_model = newton_fit(x_data, y_data)
+                uncertainty = float(self.evaluate_with_uncertainty([x_predict])[1][0])
+
+            with metrics.stage('risk'):
+                risk = self.assess_koi_risk(y_predicted)
+                
+            # Store the prediction
+            prediction = {
+                'x': x_predict,
+                'y': y_predicted,
+                'method': method,
+                'subset_size': len(self.subset),
+                'risk': risk,
+                'solution': self.last_solution,
+                'uncertainty': uncertainty,
+                # The subset the solution was worked on, so iter_solution can rebuild it in full
+                'subset_x': x_data,
+                'subset_y': y_data
+            }
+            if engine is not None:
+                prediction['method'] = 'Auto'
+                prediction['engine'] = engine
+            prediction.update(details)
+            self.predictions.append(prediction)
+            self.solution_source = source
+            self.solution_prediction = prediction
+            self.show_solution()
+            metrics.increment('predictions')
+            self.log("Extrapolation successful.")
+            
+        except Exception as e:
+            self.log(f"Extrapolation failed: {e}")
+            # Store prediction with error
+            self.last_solution = f"Error generating solution: {e}"
+            self.solution_source = None
+            self.solution_prediction = None
+            raise
+
+    def rolling_forecast(self, horizon: float) -> List[Tuple[float, float]]:
+        """
+        Walk-forward forecast over the (preprocessed) data in x order: after each
+        sample, predicts the value at x + horizon from the latest num_points samples.
+        The window is maintained incrementally, so each step costs O(num_points).
+        
+        Args:
+            horizon: Offset added to each sample's x-value.
+            
+        Returns:
+            A list of (target x, predicted y) pairs, one per sample once the window is full.
+        """
+        x_all, y_all = self.prepare_arrays()
+        order = x_all.argsort(kind='stable')
+        table = NewtonTable(max(2, self.config['num_points']))
+        forecast = []
+        for x, y in zip(x_all[order].tolist(), y_all[order].tolist()):
+            table.append(x, y)
+            if len(table) == table.max_points:
+                forecast.append((x + horizon, table.evaluate(x + horizon)))
+        return forecast
+
+    def evaluate_with_uncertainty(self, x_targets):
+        """
+        Evaluates the curve through the current subset at many x-values together with
+        an uncertainty half-width, in one vectorized pass over the fitted model
+        (fitted on first use after a new subset selection). The band is the Newton
+        remainder estimated with the next-order divided difference, using the
+        reserve point when one is available.
+        
+        Args:
+            x_targets: Sequence of x-values to evaluate.
+            
+        Returns:
+            A tuple (curve values, uncertainty half-widths) of arrays.
+        """
+        if not self.subset:
+            raise ValueError("No subset selected. Run select_extrapolation_subset first.")
+        if not self.fitted_model:
+            self.fitted_model = newton_fit([p['x'] for p in self.subset], [p['y'] for p in self.subset])
+        if not self.reserve_point:
+            return newton_remainder_evaluate(self.fitted_model, x_targets)
+        return newton_remainder_evaluate(
+            self.fitted_model, x_targets, self.reserve_point['x'], self.reserve_point['y']
+        )
+
+    def reset_live_model(self):
+        """
+        Rebuilds the live model from the newest num_points + 1 (preprocessed) samples.
+        The extra, oldest sample plays the role of the reserve point for the uncertainty band.
+        """
+        x_all, y_all = self.prepare_arrays()
+        order = x_all.argsort(kind='stable')
+        self.live_table = NewtonTable(max(2, self.config['num_points']) + 1)
+        for x, y in zip(x_all[order].tolist(), y_all[order].tolist()):
+            self.live_table.append(x, y)
+
+    def add_live_point(self, x: float, y: float):
+        """
+        Appends a sample to data_points and feeds it to the live model.
+        A sample newer than every fitted node costs O(num_points); anything else
+        (an out-of-order sample, a changed num_points, or an active resampling or
+        outlier stage) rebuilds the model from the full data.
+        
+        Args:
+            x: The x-coordinate (time) of the sample.
+            y: The y-coordinate (value) of the sample.
+        """
+        self.data_points.append({'x': x, 'y': y})
+        self.history = None
+        self.sample_flags = []
+        table = self.live_table
+        if (table is None or table.max_points != max(2, self.config['num_points']) + 1
+                or self.config['resample'] or self.config['outlier_filter']
+                or (table.nodes and x <= table.nodes[0])):
+            self.reset_live_model()
+        else:
+            table.append(x, y)
+
+    def evaluate_live(self, x_targets):
+        """
+        Evaluates the live model at many x-values. The interpolant runs through the
+        newest num_points samples; the band is the magnitude of the term added by the
+        next-newest one, as in evaluate_with_uncertainty.
+        
+        Args:
+            x_targets: Sequence of x-values to evaluate.
+            
+        Returns:
+            A tuple (curve values, uncertainty half-widths) of arrays.
+        """
+        table = self.live_table
+        if table is None or len(table) < 2:
+            raise ValueError("Not enough data points collected for extrapolation (minimum 2 required).")
+        terms = newton_terms(list(table.nodes), table.coef, x_targets)
+        reserve_last = len(table) == table.max_points
+        estimate = terms[:-1].sum(axis=0) if reserve_last else terms.sum(axis=0)
+        return estimate, abs(terms[-1])
+
+    def live_predict(self, horizon: float) -> Dict[str, Any]:
+        """
+        Predicts the value at (latest X + horizon) from the live model, without
+        re-running subset selection or generating a solution. Lagrange, Divided
+        Difference and Chebyshev all interpolate the same points, so live mode
+        shares one Newton-form model whatever the configured method. The subset
+        and reserve point are set to the live nodes, so plots and exports of the
+        live prediction show the points it was fitted on.
+        
+        Args:
+            horizon: Offset added to the latest fitted sample's x-value.
+            
+        Returns:
+            A prediction record with x, y, uncertainty, subset_size and risk.
+        """
+        if self.live_table is None or self.live_table.max_points != max(2, self.config['num_points']) + 1:
+            self.reset_live_model()
+        table = self.live_table
+        if len(table) < 2:
+            raise ValueError("Not enough data points collected for extrapolation (minimum 2 required).")
+        x_predict = table.nodes[0] + horizon
+        self.config['extrapolation_value'] = x_predict
+        y_predicted, band = self.evaluate_live([x_predict])
+        y_predicted = float(y_predicted[0])
+        # Interpolant nodes for threshold queries; newest-first Newton form, unscaled
+        subset_size = len(table) - 1 if len(table) == table.max_points else len(table)
+        live_points = [{'x': x, 'y': y} for x, y in zip(table.nodes, table.values)]
+        self.subset = live_points[:subset_size]
+        self.reserve_point = live_points[subset_size] if len(live_points) > subset_size else {}
+        self.fitted_model = {
+            'x': list(table.nodes)[:subset_size],
+            'coef': table.coef[:subset_size],
+            'centre': 0.0,
+            'scale': 1.0
+        }
+        return {
+            'x': x_predict,
+            'y': y_predicted,
+            'method': self.config['method'],
+            'subset_size': subset_size,
+            'risk': self.assess_koi_risk(y_predicted),
+            'uncertainty': float(band[0])
+        }
+
+    def predict_horizons(self, horizons: List[float]) -> List[Dict[str, Any]]:
+        """
+        Extrapolates several horizons (relative to the current max X) in one call.
+        See predict_targets for how subsets and fits are shared between targets.
+        
+        Args:
+            horizons: Offsets added to the current max X, e.g. [1, 2, 6, 12, 24].
+            
+        Returns:
+            The new prediction records, in the order of the given horizons.
+        """
+        method = self.config['method']
+        if method not in BATCH_ENGINES:
+            raise ValueError(f"Unknown extrapolation method: {method}")
+
+        import numpy as np
+
+        x_all, y_all = self.prepare_arrays()
+        n = len(x_all)
+        if n < 2:
+            raise ValueError("Not enough data points collected for extrapolation (minimum 2 required).")
+        targets = self.get_max_x() + np.asarray(horizons, dtype=float).reshape(-1)
+        num_points = max(2, min(n, self.config['num_points']))
+
+        self.log(f"--- Performing Multi-Horizon Extrapolation ({method}) ---")
+        routes: List[str] = []
+        condition_numbers: List[float] = []
+        with self.metrics.stage('predict_targets'):
+            y_predicted, uncertainty, num_subsets = predict_targets(
+                x_all, y_all, targets, num_points, method, routes, condition_numbers
+            )
+        self.log(f"{len(targets)} target(s) served by {num_subsets} distinct subset(s).")
+
+        with self.metrics.stage('risk_many'):
+            risk_codes = self.assess_koi_risk_many(y_predicted)
+        results = [
+            {
+                'x': float(x),
+                'y': float(y),
+                'method': method,
+                'subset_size': num_points,
+                'uncertainty': float(u),
+                'risk': risk_level(code)
+            }
+            for x, y, u, code in zip(targets, y_predicted, uncertainty, risk_codes)
+        ]
+        if method == 'Auto':
+            # Routing decision per target, kept with the record
+            for record, route in zip(results, routes):
+                record['engine'] = route
+        if method == 'Chebyshev':
+            for record, condition_number in zip(results, condition_numbers):
+                record['condition_number'] = condition_number
+        self.predictions.extend(results)
+        self.metrics.increment('predictions', len(results))
+        return results
+
+    def sensitivity_grid(self, horizons: List[float], sizes: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Sweeps subset size x horizon in one batched pass, so num_points and the
+        horizon can be chosen from a single table instead of repeated Calculate runs.
+        Every method interpolates the same points, so one Newton sweep serves all
+        (see sensitivity.sensitivity_grid).
+        
+        Args:
+            horizons: Offsets added to the current max X.
+            sizes: Subset sizes to sweep; defaults to 2..min(len(data), SENSITIVITY_MAX_SIZE).
+            
+        Returns:
+            A record with 1-D 'sizes', 'horizons' and 'x' (target) arrays, and 2-D
+            'y', 'uncertainty' and 'risk' (codes into koiRisk.RISK_LEVELS) arrays of
+            shape (len(sizes), len(horizons)).
+        """
+        import numpy as np
+
+        x_all, y_all = self.prepare_arrays()
+        n = len(x_all)
+        if n < 2:
+            raise ValueError("Not enough data points collected for extrapolation (minimum 2 required).")
+        if sizes is None:
+            sizes = range(2, min(n, SENSITIVITY_MAX_SIZE) + 1)
+        sizes = np.asarray(list(sizes), dtype=np.int64)
+        horizons = np.asarray(horizons, dtype=float).reshape(-1)
+        targets = self.get_max_x() + horizons
+
+        self.log(f"--- Sensitivity Grid ({len(sizes)} subset sizes x {len(horizons)} horizons) ---")
+        with self.metrics.stage('sensitivity'):
+            y_predicted, uncertainty, num_orderings = sensitivity_grid(x_all, y_all, targets, sizes)
+        self.log(f"{y_predicted.size} cell(s) served by {num_orderings} distinct node ordering(s).")
+
+        with self.metrics.stage('risk_many'):
+            risk_codes = self.assess_koi_risk_many(y_predicted)
+        return {
+            'sizes': sizes,
+            'horizons': horizons,
+            'x': targets,
+            'y': y_predicted,
+            'uncertainty': uncertainty,
+            'risk': risk_codes
+        }
+
+    def predict_parameters(self, store, horizons: List[float], risk_column: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Forecasts every parameter of a multi-series store (e.g. DO, temperature, pH)
+        at several horizons past its latest sample, using the configured method and
+        subset size. Subsets are selected once per horizon and each fit is shared by
+        all parameters (see seriesStore.predict_columns).
+        
+        Args:
+            store: A seriesStore.SeriesStore.
+            horizons: Offsets added to the store's max X.
+            risk_column: Parameter holding dissolved oxygen; its forecast sets the
+                         'risk' of each record. No risk is assessed when omitted.
+            
+        Returns:
+            One record per horizon with x, method, subset_size, and 'values' /
+            'uncertainty' mappings of parameter name -> float.
+        """
+        import numpy as np
+
+        if len(store) < 2:
+            raise ValueError("Not enough data points collected for extrapolation (minimum 2 required).")
+        if risk_column is not None and risk_column not in store.names:
+            raise ValueError(f"Unknown risk column: {risk_column!r} (parameters: {', '.join(store.names)}).")
+        method = self.config['method']
+        targets = float(store.x.max()) + np.asarray(horizons, dtype=float).reshape(-1)
+        num_points = max(2, min(len(store), self.config['num_points']))
+        routes: List[str] = []
+
+        self.log(f"--- Forecasting {len(store.names)} Parameter(s) ({method}) ---")
+        with self.metrics.stage('predict_parameters'):
+            y_predicted, uncertainty, num_subsets = store.forecast(targets, num_points, method, routes)
+        self.log(f"{len(targets)} target(s) served by {num_subsets} distinct subset(s).")
+
+        results = []
+        for m, x in enumerate(targets):
+            record = {
+                'x': float(x),
+                'method': method,
+                'subset_size': num_points,
+                'values': {name: float(y_predicted[name][m]) for name in store.names},
+                'uncertainty': {name: float(uncertainty[name][m]) for name in store.names}
+            }
+            if method == 'Auto':
+                record['engine'] = routes[m]
+            if risk_column is not None:
+                record['risk'] = self.assess_koi_risk(record['values'][risk_column])
+            results.append(record)
+        return results
+
+    def find_threshold_crossings(self, start_x: float, end_x: float, thresholds=None) -> Dict[float, Any]:
+        """
+        Finds when the last fitted curve first crosses each risk threshold.
+        
+        Args:
+            start_x: Beginning of the search window (usually the latest sample time).
+            end_x: End of the search window (usually the prediction target).
+            thresholds: Levels to check; defaults to config['risk_thresholds'].
+            
+        Returns:
+            A mapping of threshold -> earliest crossing x, or None if not crossed.
+        """
+        if not self.fitted_model:
+            raise ValueError("No fitted curve available. Run extrapolate_and_store first.")
+        if thresholds is None:
+            thresholds = self.config['risk_thresholds']
+        centre = self.fitted_model['centre']
+        scale = self.fitted_model['scale']
+        crossings = find_threshold_crossings(
+            self.fitted_model['x'], self.fitted_model['coef'],
+            (start_x - centre) / scale, (end_x - centre) / scale, thresholds
+        )
+        return {level: None if t is None else centre + t * scale for level, t in crossings.items()}
+
+    def generate_interpretation(self, current_x: float, current_y: float, pred_x: float, pred_y: float) -> str:
+        delta_y = pred_y - current_y
+        horizon = pred_x - current_x
+        direction = "Stable" if abs(delta_y) < 0.1 else ("Rising" if delta_y > 0 else "Dropping")
+        warning = ""
+        if current_y > 4.0 and pred_y < 4.0:
+            warning = "Crossing into Caution zone."
+        if pred_y < 3.0:
+            warning = "Critical Drop."
+        current_status = self.assess_koi_risk(current_y)['status']
+        future_status = self.assess_koi_risk(pred_y)['status']
+        crossing_note = ""
+        if self.fitted_model and horizon > 0:
+            crossings = self.find_threshold_crossings(current_x, pred_x)
+            reached = [
+                f"{level:.1f} mg/L at {x:.2f}"
+                for level, x in sorted(crossings.items(), key=lambda item: item[1] or 0)
+                if x is not None
+            ]
+            if reached:
+                crossing_note = f" Expected to cross {', '.join(reached)}."
+        return (
+            f"Oxygen is {direction} by {abs(delta_y):.2f} mg/L over the next {horizon:.2f} hours. "
+            f"It is projected to shift from {current_status} to {future_status}. "
+            f"Warning: {warning or 'None.'}{crossing_note}"
+        )